@@ -804,6 +804,11 @@ def preview_text(text: str, limit: int = 200) -> str:
 
 
 
+# Closed <<<...>>> markers, or <<< followed by anything up to whitespace/end of string
+# for MALFORMED markers with no closing >>> (like <<<TRANSL000000000000... that go on forever)
+_DELIMITER_MARKER_RE = re.compile(r'<<<[^>]*?>>>|<<<\S*', re.DOTALL)
+
+
 def remove_delimiter_markers(text: str) -> str:
     """
     Remove ALL delimiter markers in format <<<...>>> - catches any variations including translated/misspelled ones.
@@ -813,19 +818,8 @@ def remove_delimiter_markers(text: str) -> str:
     if not text:
         return text
     
-    # First: Remove properly closed markers <<<...>>>
-    text = re.sub(r'<<<[^>]*?>>>', '', text, flags=re.DOTALL)
-    
-    # Second: Remove MALFORMED markers that start with <<< but have no closing >>>
-    # Match <<< followed by ANY characters (including newlines) until whitespace or end of string
-    # This catches cases like <<<TRANSL000000000000... that go on forever
-    # Use non-greedy match to stop at first whitespace
-    text = re.sub(r'<<<[^\s]*', '', text)
-    
-    # Also catch any remaining <<< patterns (defensive)
-    text = re.sub(r'<<<.*?(?=\s|$)', '', text, flags=re.DOTALL)
-    
-    return text
+    # Single pass: the closed form is tried first at each <<<, the malformed form otherwise
+    return _DELIMITER_MARKER_RE.sub('', text)
 
 def roman_to_arabic(roman: str) -> int:
     """Convert a Roman numeral string to Arabic integer."""
@@ -2104,9 +2098,11 @@ async def translate_document_content_async(file_bytes: bytes, file_name: str, la
                 preserver = RobustFormatPreserver(doc)
                 
                 # Create marked texts for this batch
+                formatted_batch = preserver.create_formatted_texts_for_translation(
+                    [(para_idx, para) for para_idx, para, original in batch]
+                )
                 marked_batch = []
-                for para_idx, para, original in batch:
-                    marked_text, para_data = preserver.create_formatted_text_for_translation(para, para_idx)
+                for (para_idx, para, original), (marked_text, para_data) in zip(batch, formatted_batch):
                     marked_batch.append((para_idx, marked_text))
                     print(f"[ROBUST INPUT] Para {para_idx} ({len(original)} chars): {preview_text(original)}")
                 
@@ -2754,11 +2750,11 @@ async def translate_document_content_async_robust(
         format_types = set()
         for run_data in para_data['runs']:
             fmt = run_data['format']
-            if fmt.get('bold'): format_types.add('bold')
-            if fmt.get('italic'): format_types.add('italic')
-            if fmt.get('underline'): format_types.add('underline')
-            if fmt.get('font_name'): format_types.add('font')
-            if fmt.get('font_color'): format_types.add('color')
+            if fmt.bold: format_types.add('bold')
+            if fmt.italic: format_types.add('italic')
+            if fmt.underline: format_types.add('underline')
+            if fmt.font_name: format_types.add('font')
+            if fmt.font_color: format_types.add('color')
         
         logs.append(f"[PARA {i}] {run_count} runs, {len(format_types)} format types: {format_types}")
         
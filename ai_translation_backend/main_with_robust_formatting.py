@@ -58,11 +58,11 @@ async def translate_document_content_async_robust(
         format_types = set()
         for run_data in para_data['runs']:
             fmt = run_data['format']
-            if fmt.get('bold'): format_types.add('bold')
-            if fmt.get('italic'): format_types.add('italic')
-            if fmt.get('underline'): format_types.add('underline')
-            if fmt.get('font_name'): format_types.add('font')
-            if fmt.get('font_color'): format_types.add('color')
+            if fmt.bold: format_types.add('bold')
+            if fmt.italic: format_types.add('italic')
+            if fmt.underline: format_types.add('underline')
+            if fmt.font_name: format_types.add('font')
+            if fmt.font_color: format_types.add('color')
         
         logs.append(f"[PARA {i}] {run_count} runs, {len(format_types)} format types: {format_types}")
         
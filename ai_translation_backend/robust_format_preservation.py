@@ -3,15 +3,20 @@ Robust Format Preservation System - 100% Formatting Retention
 Handles ALL Word document formatting with complete accuracy
 """
 
+import functools
 import json
 import re
-from typing import List, Dict, Tuple, Any, Optional
+import traceback
+from typing import List, Dict, Tuple, Any, Optional, Iterable
 from docx import Document
 from docx.text.paragraph import Paragraph
+from docx.text.parfmt import ParagraphFormat
 from docx.text.run import Run
 from docx.shared import RGBColor, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE
-from dataclasses import dataclass, asdict
+from docx.oxml import OxmlElement, parse_xml
+from lxml import etree
+from dataclasses import dataclass, asdict, field, replace
 import hashlib
 
 
@@ -48,6 +53,17 @@ def _safe_float(value):
     # Handle python-docx Length objects (they have .pt property)
     if hasattr(value, 'pt'):
         return float(value.pt)
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                return None
+            return float(value)
+        return float(value)
+    except (ValueError, TypeError):
+        return None
 
 
 def ensure_heading_bold(para):
@@ -93,17 +109,6 @@ def ensure_heading_bold(para):
         for run in para.runs:
             if run.bold is None or run.bold is False:
                 run.bold = True
-    if isinstance(value, (int, float)):
-        return float(value)
-    try:
-        if isinstance(value, str):
-            value = value.strip()
-            if not value:
-                return None
-            return float(value)
-        return float(value)
-    except (ValueError, TypeError):
-        return None
 
 
 def _roman_to_arabic(roman: str) -> int:
@@ -280,7 +285,132 @@ def convert_roman_numerals_in_text(text: str) -> str:
     return text
 
 
-@dataclass
+# Marker cleanup patterns, compiled once for the parse/apply hot path
+_ANY_MARKER_RE = re.compile(r'««[^»]+»»')
+# Delimiter markers: a closed <<<...>>> first, otherwise <<< plus everything up to
+# the next whitespace (malformed markers like <<<TRANSL000...). One alternation covers
+# what the closed / <<<[^\s]* / <<<.*?(?=\s|$) passes did, since the last two match the same spans.
+_DELIM_RE = re.compile(r'<<<[^>]*?>>>|<<<\S*', re.DOTALL)
+# Single-pass equivalent of _ANY_MARKER_RE followed by _DELIM_RE.
+# Alternation order matters: a closed <<<...>>> is tried before the bare <<<\S* form.
+_ALL_MARKERS_RE = re.compile(r'««[^»]+»»|<<<[^>]*?>>>|<<<\S*', re.DOTALL)
+# Run open marker for parse_translated_text (run id in group 1)
+_RUN_OPEN_RE = re.compile(r'««RUN(\d+):[^»]+»»')
+_PARTIAL_OPEN_RE = re.compile(r'««.*')
+_PARTIAL_CLOSE_RE = re.compile(r'.*»»')
+
+
+def _strip_delimiter_markers(text: str) -> str:
+    """Remove <<<...>>> delimiter markers, including malformed ones without a closing >>>."""
+    return _DELIM_RE.sub('', text)
+
+
+def _strip_all_markers(text: str) -> str:
+    """Remove ««...»» run markers and all <<<...>>> delimiter markers in one pass."""
+    return _ALL_MARKERS_RE.sub('', text)
+
+
+@functools.lru_cache(maxsize=2048)
+def _attr_str(sig: tuple) -> str:
+    """
+    Marker attribute string for a RunFormatting signature.
+    Documents use only a handful of distinct run formats, so this is nearly always a cache hit.
+    """
+    (bold, italic, underline, strike, double_strike, subscript, superscript,
+     font_name, font_size, font_color, highlight_color,
+     all_caps, small_caps, shadow, emboss, imprint, outline,
+     _character_spacing, _position) = sig
+    
+    attrs = []
+    if bold: attrs.append("B")
+    if italic: attrs.append("I")
+    if underline: attrs.append("U")
+    if strike: attrs.append("S")
+    if double_strike: attrs.append("DS")
+    if subscript: attrs.append("SUB")
+    if superscript: attrs.append("SUP")
+    if font_name: attrs.append(f"F:{font_name.replace(' ', '_')}")
+    if font_size: attrs.append(f"SZ:{font_size}")
+    if font_color: attrs.append(f"C:{font_color}")
+    if highlight_color: attrs.append(f"H:{highlight_color}")
+    if all_caps: attrs.append("AC")
+    if small_caps: attrs.append("SC")
+    if shadow: attrs.append("SH")
+    if emboss: attrs.append("EM")
+    if imprint: attrs.append("IM")
+    if outline: attrs.append("OL")
+    
+    return ",".join(attrs) if attrs else "PLAIN"
+
+
+@functools.lru_cache(maxsize=256)
+def _pt_cached(value) -> Pt:
+    """
+    Pt(value), memoized. Documents reuse a handful of point sizes/indents and Length
+    objects are immutable ints, so the same instance can be shared. Values are not
+    rounded - Word stores twips, so sub-point precision is significant.
+    """
+    return Pt(value)
+
+
+@functools.lru_cache(maxsize=2048)
+def _run_apply_ops(sig: tuple) -> Tuple[Tuple[str, str, Any], ...]:
+    """
+    (target, attribute, value) assignments that apply a RunFormatting signature to a run,
+    where target is 'run', 'font' or 'color' (run.font.color). Only set properties are
+    included, so applying a plain run does no work beyond the loop over an empty tuple.
+    """
+    (bold, italic, underline, strike, double_strike, subscript, superscript,
+     font_name, font_size, font_color, _highlight_color,
+     all_caps, small_caps, shadow, emboss, imprint, outline,
+     _character_spacing, _position) = sig
+    
+    ops = []
+    # Basic formatting - only apply if value is explicitly True or False (not None)
+    for name, value in (('bold', bold), ('italic', italic), ('underline', underline)):
+        if value is not None:
+            ops.append(('run', name, value))
+    for name, value in (('strike', strike), ('double_strike', double_strike),
+                        ('subscript', subscript), ('superscript', superscript)):
+        if value is not None:
+            ops.append(('font', name, value))
+    
+    # Font properties
+    if font_name:
+        ops.append(('font', 'name', font_name))
+    if font_size:
+        # Use _safe_int to handle any float values stored
+        size_val = _safe_int(font_size)
+        if size_val:
+            ops.append(('font', 'size', _pt_cached(size_val)))
+    
+    # Color handling - theme colors would need special handling, so only RGB is applied
+    if font_color and not str(font_color).startswith('theme:'):
+        try:
+            # Parse RGB color - handle both int and float strings using _safe_int
+            rgb_int = _safe_int(font_color)
+            
+            # Validate RGB value is in valid range (0 to 16777215 = 0xFFFFFF)
+            if rgb_int is not None and 0 <= rgb_int <= 16777215:
+                ops.append(('color', 'rgb', RGBColor(
+                    (rgb_int >> 16) & 0xFF,
+                    (rgb_int >> 8) & 0xFF,
+                    rgb_int & 0xFF
+                )))
+        except (ValueError, TypeError, OverflowError):
+            # Invalid color value - skip color setting
+            pass
+    
+    # Advanced formatting
+    for name, value in (('all_caps', all_caps), ('small_caps', small_caps), ('shadow', shadow),
+                        ('emboss', emboss), ('imprint', imprint), ('outline', outline)):
+        if value is not None:
+            ops.append(('font', name, value))
+    
+    return tuple(ops)
+
+
+@dataclass(slots=True)
 class RunFormatting:
     """Complete formatting information for a run"""
     text: str
@@ -303,33 +433,27 @@ class RunFormatting:
     outline: Optional[bool] = None
     character_spacing: Optional[int] = None
     position: Optional[int] = None
+    # Format signature computed once at extraction time (see _get_format_signature)
+    _sig: Optional[tuple] = field(default=None, repr=False, compare=False)
+    
+    def signature(self) -> tuple:
+        """Formatting signature (everything except text), in _attr_str order"""
+        if self._sig is not None:
+            return self._sig
+        return (
+            self.bold, self.italic, self.underline, self.strike, self.double_strike,
+            self.subscript, self.superscript,
+            self.font_name, self.font_size, self.font_color, self.highlight_color,
+            self.all_caps, self.small_caps, self.shadow, self.emboss, self.imprint, self.outline,
+            self.character_spacing, self.position
+        )
     
     def to_marker(self, run_id: int) -> str:
         """Convert formatting to a unique marker"""
-        attrs = []
-        if self.bold: attrs.append("B")
-        if self.italic: attrs.append("I")
-        if self.underline: attrs.append("U")
-        if self.strike: attrs.append("S")
-        if self.double_strike: attrs.append("DS")
-        if self.subscript: attrs.append("SUB")
-        if self.superscript: attrs.append("SUP")
-        if self.font_name: attrs.append(f"F:{self.font_name.replace(' ', '_')}")
-        if self.font_size: attrs.append(f"SZ:{self.font_size}")
-        if self.font_color: attrs.append(f"C:{self.font_color}")
-        if self.highlight_color: attrs.append(f"H:{self.highlight_color}")
-        if self.all_caps: attrs.append("AC")
-        if self.small_caps: attrs.append("SC")
-        if self.shadow: attrs.append("SH")
-        if self.emboss: attrs.append("EM")
-        if self.imprint: attrs.append("IM")
-        if self.outline: attrs.append("OL")
-        
-        attr_str = ",".join(attrs) if attrs else "PLAIN"
-        return f"««RUN{run_id}:{attr_str}»»"
+        return f"««RUN{run_id}:{_attr_str(self.signature())}»»"
 
 
-@dataclass
+@dataclass(slots=True)
 class ParagraphFormatting:
     """Complete formatting information for a paragraph"""
     style: Optional[str] = None
@@ -350,6 +474,200 @@ class ParagraphFormatting:
     def __post_init__(self):
         if self.tab_stops is None:
             self.tab_stops = []
+    
+    def signature(self) -> tuple:
+        """Hashable form of every field (tab stops included), for deduplicating paragraph formats"""
+        return (
+            self.style, self.alignment, self.left_indent, self.right_indent, self.first_line_indent,
+            self.space_before, self.space_after, self.line_spacing, self.line_spacing_rule,
+            self.keep_together, self.keep_with_next, self.page_break_before, self.widow_control,
+            tuple((tab['position'], tab['alignment'], tab['leader']) for tab in self.tab_stops)
+        )
+
+
+def _read_run_formatting(run: Run) -> RunFormatting:
+    """Read complete formatting from a run via python-docx properties"""
+    # Get font color - store as integer to avoid float string issues
+    font_color = None
+    if run.font.color and run.font.color.rgb:
+        # Convert RGBColor to integer value to avoid float string conversion issues
+        rgb_val = run.font.color.rgb
+        try:
+            # RGBColor has __int__ method
+            if hasattr(rgb_val, '__int__'):
+                font_color = str(int(rgb_val))
+            elif isinstance(rgb_val, (int, float)):
+                font_color = str(int(rgb_val))
+            else:
+                # Fallback: try to parse as string
+                rgb_str = str(rgb_val)
+                try:
+                    font_color = str(int(rgb_str))
+                except ValueError:
+                    font_color = str(int(float(rgb_str)))
+        except Exception as e:
+            font_color = None
+    elif run.font.color and run.font.color.theme_color:
+        font_color = f"theme:{run.font.color.theme_color}"
+        
+    # Get highlight color
+    highlight_color = None
+    if run.font.highlight_color:
+        highlight_color = str(run.font.highlight_color)
+    
+    # Get font size - MUST use _safe_int to handle Length objects returning floats
+    font_size = None
+    if run.font.size:
+        font_size = _safe_int(run.font.size)
+    
+    # Get character spacing and position - use _safe_int for safety
+    character_spacing = _safe_int(getattr(run.font, 'spacing', None))
+    position = _safe_int(getattr(run.font, 'position', None))
+
+    # Ensure boolean values are explicitly True/False, not None
+    # python-docx can return None for unset properties, but we need explicit values
+    bold = bool(run.bold) if run.bold is not None else False
+    italic = bool(run.italic) if run.italic is not None else False
+    underline = bool(run.underline) if run.underline is not None else False
+    strike = bool(run.font.strike) if run.font.strike is not None else False
+    double_strike = bool(run.font.double_strike) if run.font.double_strike is not None else False
+    subscript = bool(run.font.subscript) if run.font.subscript is not None else False
+    superscript = bool(run.font.superscript) if run.font.superscript is not None else False
+    font_name = run.font.name
+    all_caps = bool(run.font.all_caps) if run.font.all_caps is not None else False
+    small_caps = bool(run.font.small_caps) if run.font.small_caps is not None else False
+    shadow = bool(run.font.shadow) if run.font.shadow is not None else False
+    emboss = bool(run.font.emboss) if run.font.emboss is not None else False
+    imprint = bool(run.font.imprint) if run.font.imprint is not None else False
+    outline = bool(run.font.outline) if run.font.outline is not None else False
+    
+    # Format signature built from the locals (same order as _get_format_signature)
+    sig = (
+        bold, italic, underline, strike, double_strike, subscript, superscript,
+        font_name, font_size, font_color, highlight_color,
+        all_caps, small_caps, shadow, emboss, imprint, outline,
+        character_spacing, position
+    )
+    
+    return RunFormatting(
+        text=run.text,
+        bold=bold,
+        italic=italic,
+        underline=underline,
+        strike=strike,
+        double_strike=double_strike,
+        subscript=subscript,
+        superscript=superscript,
+        font_name=font_name,
+        font_size=font_size,
+        font_color=font_color,
+        highlight_color=highlight_color,
+        all_caps=all_caps,
+        small_caps=small_caps,
+        shadow=shadow,
+        emboss=emboss,
+        imprint=imprint,
+        outline=outline,
+        character_spacing=character_spacing,
+        position=position,
+        _sig=sig
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _run_formatting_for_rpr(rpr_xml: bytes) -> RunFormatting:
+    """
+    Formatting (with empty text) for serialized <w:rPr> XML (b'' for a run without one).
+    Direct run formatting lives entirely in <w:rPr>, and a document uses only a handful
+    of distinct ones, so this is nearly always a cache hit.
+    The returned RunFormatting is shared between callers and must not be mutated.
+    """
+    r = OxmlElement('w:r')
+    if rpr_xml:
+        r.append(parse_xml(rpr_xml))
+    return _read_run_formatting(Run(r, None))
+
+
+# Stand-in for parsed runs that have no stored formatting (every field None = apply nothing)
+_UNFORMATTED_RUN = RunFormatting(text='')
+
+
+class _PackedFormatMap:
+    """
+    para_id -> para_data store that keeps each paragraph as compact JSON bytes.
+    
+    A whole manuscript's format data stays resident between extraction and apply, and a
+    dict tree per paragraph costs far more memory than its JSON. Run formats are interned
+    once per distinct signature and referenced by index; get() rebuilds the para_data
+    dict (with RunFormatting objects and runs_by_id) on access. Paragraph format dicts
+    are already shared per distinct format by the preserver, so they are interned by
+    identity and handed back as the same (read-only) dict.
+    """
+    
+    def __init__(self):
+        self._packed: Dict[int, bytes] = {}
+        self._formats: List[RunFormatting] = []
+        self._format_index: Dict[tuple, int] = {}
+        self._para_formats: List[Dict] = []
+        self._para_format_index: Dict[int, int] = {}
+    
+    def _intern_format(self, run_format: Optional[RunFormatting]) -> Optional[int]:
+        if run_format is None:
+            return None
+        sig = run_format.signature()
+        index = self._format_index.get(sig)
+        if index is None:
+            index = len(self._formats)
+            self._formats.append(run_format)
+            self._format_index[sig] = index
+        return index
+    
+    def _intern_para_format(self, para_format: Dict) -> int:
+        # Keyed by id() - the list keeps each dict alive, so ids cannot be reused
+        index = self._para_format_index.get(id(para_format))
+        if index is None:
+            index = len(self._para_formats)
+            self._para_formats.append(para_format)
+            self._para_format_index[id(para_format)] = index
+        return index
+    
+    def __setitem__(self, para_id: int, para_data: Dict):
+        packed = {key: value for key, value in para_data.items() if key not in ('runs', 'runs_by_id')}
+        packed['format'] = self._intern_para_format(para_data['format'])
+        packed['runs'] = [
+            dict(run_data, format=self._intern_format(run_data['format']))
+            for run_data in para_data['runs']
+        ]
+        self._packed[para_id] = json.dumps(packed, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    
+    def update(self, items: Iterable[Tuple[int, Dict]]):
+        for para_id, para_data in items:
+            self[para_id] = para_data
+    
+    def get(self, para_id: int, default=None) -> Optional[Dict]:
+        packed = self._packed.get(para_id)
+        if packed is None:
+            return default
+        para_data = json.loads(packed)
+        para_data['format'] = self._para_formats[para_data['format']]
+        formats = self._formats
+        for run_data in para_data['runs']:
+            if run_data['format'] is not None:
+                run_data['format'] = formats[run_data['format']]
+        para_data['runs_by_id'] = {run_data['id']: run_data for run_data in para_data['runs']}
+        return para_data
+    
+    def __getitem__(self, para_id: int) -> Dict:
+        para_data = self.get(para_id)
+        if para_data is None:
+            raise KeyError(para_id)
+        return para_data
+    
+    def __contains__(self, para_id) -> bool:
+        return para_id in self._packed
+    
+    def __len__(self) -> int:
+        return len(self._packed)
 
 
 class RobustFormatPreserver:
@@ -357,82 +675,48 @@ class RobustFormatPreserver:
     
     def __init__(self, doc: Document):
         self.doc = doc
-        self.format_map = {}
+        self.format_map = _PackedFormatMap()
         self.run_counter = 0
+        # (RunFormatting, signature) keyed by id(run._element). Only valid while the
+        # run elements are referenced, so it is reset for every paragraph.
+        self._run_fmt_cache: Dict[int, Tuple[RunFormatting, tuple]] = {}
+        # asdict(ParagraphFormatting) keyed by its signature - documents use only a few
+        # distinct paragraph formats, so para_data['format'] dicts are shared (read-only)
+        self._para_format_cache: Dict[tuple, Dict] = {}
         
     def extract_run_formatting(self, run: Run) -> RunFormatting:
         """Extract complete formatting from a run"""
-        import traceback
+        return self._extract_run_format_and_signature(run)[0]
+    
+    def _extract_run_format_and_signature(self, run: Run, rpr_xml: Optional[bytes] = None) -> Tuple[RunFormatting, tuple]:
+        """
+        Extract run formatting and its signature, reusing the result for an already-seen run element.
+        rpr_xml is the run's serialized <w:rPr> (b'' for none), if the caller already has it.
+        """
+        key = id(run._element)
+        cached = self._run_fmt_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            return self._extract_run_formatting_impl(run)
+            run_format = self._extract_run_formatting_impl(run, rpr_xml)
         except Exception as e:
             print(f"[EXTRACT ERROR] Failed to extract run formatting: {e}")
             print(f"[EXTRACT ERROR] Traceback:\n{traceback.format_exc()}")
             raise
+        
+        result = (run_format, self._get_format_signature(run_format))
+        self._run_fmt_cache[key] = result
+        return result
     
-    def _extract_run_formatting_impl(self, run: Run) -> RunFormatting:
+    def _extract_run_formatting_impl(self, run: Run, rpr_xml: Optional[bytes] = None) -> RunFormatting:
         """Internal implementation of run formatting extraction"""
-        # Get font color - store as integer to avoid float string issues
-        font_color = None
-        if run.font.color and run.font.color.rgb:
-            # Convert RGBColor to integer value to avoid float string conversion issues
-            rgb_val = run.font.color.rgb
-            try:
-                # RGBColor has __int__ method
-                if hasattr(rgb_val, '__int__'):
-                    font_color = str(int(rgb_val))
-                elif isinstance(rgb_val, (int, float)):
-                    font_color = str(int(rgb_val))
-                else:
-                    # Fallback: try to parse as string
-                    rgb_str = str(rgb_val)
-                    try:
-                        font_color = str(int(rgb_str))
-                    except ValueError:
-                        font_color = str(int(float(rgb_str)))
-            except Exception as e:
-                font_color = None
-        elif run.font.color and run.font.color.theme_color:
-            font_color = f"theme:{run.font.color.theme_color}"
-            
-        # Get highlight color
-        highlight_color = None
-        if run.font.highlight_color:
-            highlight_color = str(run.font.highlight_color)
-        
-        # Get font size - MUST use _safe_int to handle Length objects returning floats
-        font_size = None
-        if run.font.size:
-            font_size = _safe_int(run.font.size)
-        
-        # Get character spacing and position - use _safe_int for safety
-        character_spacing = _safe_int(getattr(run.font, 'spacing', None))
-        position = _safe_int(getattr(run.font, 'position', None))
-
-        # Ensure boolean values are explicitly True/False, not None
-        # python-docx can return None for unset properties, but we need explicit values
-        return RunFormatting(
-            text=run.text,
-            bold=bool(run.bold) if run.bold is not None else False,
-            italic=bool(run.italic) if run.italic is not None else False,
-            underline=bool(run.underline) if run.underline is not None else False,
-            strike=bool(run.font.strike) if run.font.strike is not None else False,
-            double_strike=bool(run.font.double_strike) if run.font.double_strike is not None else False,
-            subscript=bool(run.font.subscript) if run.font.subscript is not None else False,
-            superscript=bool(run.font.superscript) if run.font.superscript is not None else False,
-            font_name=run.font.name,
-            font_size=font_size,
-            font_color=font_color,
-            highlight_color=highlight_color,
-            all_caps=bool(run.font.all_caps) if run.font.all_caps is not None else False,
-            small_caps=bool(run.font.small_caps) if run.font.small_caps is not None else False,
-            shadow=bool(run.font.shadow) if run.font.shadow is not None else False,
-            emboss=bool(run.font.emboss) if run.font.emboss is not None else False,
-            imprint=bool(run.font.imprint) if run.font.imprint is not None else False,
-            outline=bool(run.font.outline) if run.font.outline is not None else False,
-            character_spacing=character_spacing,
-            position=position
-        )
+        # Runs with identical <w:rPr> XML share a single extraction; only the text differs
+        if rpr_xml is None:
+            rpr = run._r.rPr
+            rpr_xml = etree.tostring(rpr) if rpr is not None else b''
+        shared = _run_formatting_for_rpr(rpr_xml)
+        return replace(shared, text=run.text)
     
     def extract_paragraph_formatting(self, para: Paragraph) -> ParagraphFormatting:
         """Extract complete paragraph formatting"""
@@ -445,59 +729,51 @@ class RobustFormatPreserver:
             except (ValueError, TypeError, AttributeError):
                 return default
         
+        style = safe_get(lambda: para.style.name if para.style else None)
+        
+        # Read <w:pPr> once and take every value straight from it - going through
+        # para.paragraph_format re-resolves pPr (and its children) for each property
+        pPr = para._p.pPr
+        if pPr is None:
+            return ParagraphFormatting(style=style)
+        
         # Extract tab stops - use _safe_float to handle Length objects
         tab_stops = []
         try:
-            if para.paragraph_format.tab_stops:
-                for tab in para.paragraph_format.tab_stops:
+            tabs = pPr.tabs
+            if tabs is not None:
+                for tab in tabs.tab_lst:
                     tab_stops.append({
-                        'position': _safe_float(tab.position),
-                        'alignment': tab.alignment,
+                        'position': _safe_float(tab.pos),
+                        'alignment': tab.val,
                         'leader': tab.leader
                     })
         except (ValueError, TypeError, AttributeError):
             pass  # Skip corrupt tab stops
         
+        spacing_line = safe_get(lambda: pPr.spacing_line)
+        spacing_line_rule = safe_get(lambda: pPr.spacing_lineRule)
+        
         return ParagraphFormatting(
-            style=safe_get(lambda: para.style.name if para.style else None),
-            alignment=safe_get(lambda: para.alignment),
-            left_indent=safe_get(lambda: _safe_float(para.paragraph_format.left_indent)),
-            right_indent=safe_get(lambda: _safe_float(para.paragraph_format.right_indent)),
-            first_line_indent=safe_get(lambda: _safe_float(para.paragraph_format.first_line_indent)),
-            space_before=safe_get(lambda: _safe_float(para.paragraph_format.space_before)),
-            space_after=safe_get(lambda: _safe_float(para.paragraph_format.space_after)),
-            line_spacing=safe_get(lambda: _safe_float(para.paragraph_format.line_spacing)),
-            line_spacing_rule=safe_get(lambda: para.paragraph_format.line_spacing_rule),
-            keep_together=safe_get(lambda: para.paragraph_format.keep_together),
-            keep_with_next=safe_get(lambda: para.paragraph_format.keep_with_next),
-            page_break_before=safe_get(lambda: para.paragraph_format.page_break_before),
-            widow_control=safe_get(lambda: para.paragraph_format.widow_control),
+            style=style,
+            alignment=safe_get(lambda: pPr.jc_val),
+            left_indent=safe_get(lambda: _safe_float(pPr.ind_left)),
+            right_indent=safe_get(lambda: _safe_float(pPr.ind_right)),
+            first_line_indent=safe_get(lambda: _safe_float(pPr.first_line_indent)),
+            space_before=safe_get(lambda: _safe_float(pPr.spacing_before)),
+            space_after=safe_get(lambda: _safe_float(pPr.spacing_after)),
+            line_spacing=safe_get(lambda: _safe_float(ParagraphFormat._line_spacing(spacing_line, spacing_line_rule))),
+            line_spacing_rule=safe_get(lambda: ParagraphFormat._line_spacing_rule(spacing_line, spacing_line_rule)),
+            keep_together=safe_get(lambda: pPr.keepLines_val),
+            keep_with_next=safe_get(lambda: pPr.keepNext_val),
+            page_break_before=safe_get(lambda: pPr.pageBreakBefore_val),
+            widow_control=safe_get(lambda: pPr.widowControl_val),
             tab_stops=tab_stops
         )
     
     def _get_format_signature(self, run_format: RunFormatting) -> tuple:
         """Create a format signature for comparison (excludes text)"""
-        return (
-            run_format.bold,
-            run_format.italic,
-            run_format.underline,
-            run_format.strike,
-            run_format.double_strike,
-            run_format.subscript,
-            run_format.superscript,
-            run_format.font_name,
-            run_format.font_size,
-            run_format.font_color,
-            run_format.highlight_color,
-            run_format.all_caps,
-            run_format.small_caps,
-            run_format.shadow,
-            run_format.emboss,
-            run_format.imprint,
-            run_format.outline,
-            run_format.character_spacing,
-            run_format.position
-        )
+        return run_format.signature()
     
     def _has_significant_case_change(self, text: str) -> bool:
         """
@@ -607,20 +883,36 @@ class RobustFormatPreserver:
         current_group = {
             'runs': [],
             'run_indices': [],  # Track indices to avoid index() lookup issues
-            'text': '',
+            'text_parts': [],  # Joined into 'text' once the group is complete
             'format': None,
-            'format_obj': None
+            'format_obj': None,
+            'rpr_xml': None  # Serialized <w:rPr> of the run that opened the group
         }
         
+        # Snapshot the runs once - keeps the run elements alive for the formatting cache
+        runs = para.runs
+        self._run_fmt_cache.clear()
+        
         # Track indices as we iterate to avoid index() lookup issues
         i = 0
-        while i < len(para.runs):
-            run = para.runs[i]
+        while i < len(runs):
+            run = runs[i]
             run_text = run.text
+            
+            # Identical <w:rPr> XML means identical formatting - extend the group
+            # without extracting formatting for this run at all
+            rpr = run._r.rPr
+            rpr_xml = etree.tostring(rpr) if rpr is not None else b''
+            if current_group['format'] is not None and rpr_xml == current_group['rpr_xml']:
+                current_group['runs'].append(run)
+                current_group['run_indices'].append(i)
+                current_group['text_parts'].append(run_text)
+                i += 1
+                continue
+            
             is_whitespace = is_whitespace_only(run_text)
             is_punctuation = is_punctuation_only(run_text)
-            run_format = self.extract_run_formatting(run)
-            format_sig = self._get_format_signature(run_format)
+            run_format, format_sig = self._extract_run_format_and_signature(run, rpr_xml)
             
             # Look ahead to see if there are consecutive runs with same formatting separated by punctuation/whitespace
             # This handles: RUN4(italic) -> RUN5(", ", non-italic) -> RUN6(italic) = should merge to one italic group
@@ -628,17 +920,16 @@ class RobustFormatPreserver:
                 # Different formatting - check if we can merge across punctuation/whitespace
                 if is_whitespace or is_punctuation:
                     # This is whitespace or punctuation-only - look ahead to see if next run matches current group format
-                    if i + 1 < len(para.runs):
-                        next_run = para.runs[i + 1]
-                        next_run_format = self.extract_run_formatting(next_run)
-                        next_format_sig = self._get_format_signature(next_run_format)
+                    if i + 1 < len(runs):
+                        next_run = runs[i + 1]
+                        next_run_format, next_format_sig = self._extract_run_format_and_signature(next_run)
                         
                         if next_format_sig == current_group['format']:
                             # Next run matches current group - merge punctuation/whitespace and continue
                             # This allows: italic -> ", " -> italic to merge as one italic group
                             current_group['runs'].append(run)
                             current_group['run_indices'].append(i)
-                            current_group['text'] += run_text
+                            current_group['text_parts'].append(run_text)
                             i += 1
                             continue  # Skip to next iteration to process the matching run
                 
@@ -647,9 +938,10 @@ class RobustFormatPreserver:
                 current_group = {
                     'runs': [],
                     'run_indices': [],
-                    'text': '',
+                    'text_parts': [],
                     'format': None,
-                    'format_obj': None
+                    'format_obj': None,
+                    'rpr_xml': None
                 }
             
             # Check if this run has the same formatting as current group
@@ -657,22 +949,23 @@ class RobustFormatPreserver:
                 # First run or new group - start it
                 current_group['runs'] = [run]
                 current_group['run_indices'] = [i]
-                current_group['text'] = run_text  # Includes spaces!
+                current_group['text_parts'] = [run_text]  # Includes spaces!
                 current_group['format'] = format_sig
                 current_group['format_obj'] = run_format
+                current_group['rpr_xml'] = rpr_xml
             elif format_sig == current_group['format']:
                 # Same formatting - merge into current group
                 # CRITICAL: run.text already contains spaces, so concatenation preserves spacing
                 current_group['runs'].append(run)
                 current_group['run_indices'].append(i)
-                current_group['text'] += run_text  # Spaces preserved automatically!
+                current_group['text_parts'].append(run_text)  # Spaces preserved automatically!
             elif is_whitespace or is_punctuation:
                 # Whitespace/punctuation-only run with different formatting - treat as transparent
                 # Merge it into current group to preserve spacing/punctuation, but keep current formatting
                 # This allows runs with same formatting to merge across punctuation/whitespace runs
                 current_group['runs'].append(run)
                 current_group['run_indices'].append(i)
-                current_group['text'] += run_text  # Preserve the whitespace/punctuation
+                current_group['text_parts'].append(run_text)  # Preserve the whitespace/punctuation
                 # Don't change format or format_obj - keep current group's formatting
             else:
                 # Different formatting and not whitespace - save current group and start new one
@@ -680,9 +973,10 @@ class RobustFormatPreserver:
                 current_group = {
                     'runs': [run],
                     'run_indices': [i],
-                    'text': run_text,
+                    'text_parts': [run_text],
                     'format': format_sig,
-                    'format_obj': run_format
+                    'format_obj': run_format,
+                    'rpr_xml': rpr_xml
                 }
             
             i += 1
@@ -696,7 +990,9 @@ class RobustFormatPreserver:
         # Example: "HELLO, how you doing?" should be split into "HELLO, " and "how you doing?"
         final_groups = []
         for group in merged_groups:
-            text = group['text']
+            text = ''.join(group.pop('text_parts'))
+            group['text'] = text
+            del group['rpr_xml']
             format_obj = group['format_obj']
             
             # Check if this group has significant case changes (all-caps words mixed with mixed-case)
@@ -713,13 +1009,15 @@ class RobustFormatPreserver:
                         'runs': group['runs'],  # Keep reference to original runs
                         'run_indices': group['run_indices'],
                         'text': seg_text,
-                        'format': self._get_format_signature(format_obj),
+                        'format': group['format'],
                         'format_obj': format_obj  # Same formatting, just different case pattern
                     })
             else:
                 # No significant case changes, keep as is
                 final_groups.append(group)
         
+        # Element ids are only meaningful while this paragraph's runs are alive
+        self._run_fmt_cache.clear()
         return final_groups
     
     def create_formatted_text_for_translation(self, para: Paragraph, para_id: int) -> Tuple[str, Dict]:
@@ -730,9 +1028,24 @@ class RobustFormatPreserver:
         Key insight: run.text already contains spaces, so merging by concatenation preserves spacing perfectly.
         This fixes the issue where many small runs cause spacing problems.
         """
+        marked_text, para_data = self._build_para_data(para, para_id)
+        self.format_map[para_id] = para_data
+        return marked_text, para_data
+    
+    def create_formatted_texts_for_translation(self, paras: List[Tuple[int, Paragraph]]) -> List[Tuple[str, Dict]]:
+        """
+        Batch version of create_formatted_text_for_translation for (para_id, paragraph) pairs.
+        Extracts every paragraph in one loop and registers them in format_map in a single update.
+        """
+        results = [self._build_para_data(para, para_id) for para_id, para in paras]
+        self.format_map.update((para_data['id'], para_data) for _, para_data in results)
+        return results
+    
+    def _build_para_data(self, para: Paragraph, para_id: int) -> Tuple[str, Dict]:
+        """Build the marked text and format data for one paragraph (without registering it)"""
         para_format = self.extract_paragraph_formatting(para)
         runs_data = []
-        marked_text = ""
+        marked_parts = []
         
         # OPTIMIZATION: Merge consecutive runs with identical formatting
         # This dramatically reduces run count while preserving exact spacing
@@ -751,88 +1064,114 @@ class RobustFormatPreserver:
             marker = run_format.to_marker(run_id)
             
             # Add to marked text
-            marked_text += f"{marker}{merged_text}««/RUN{run_id}»»"
+            marked_parts.append(marker)
+            marked_parts.append(merged_text)
+            marked_parts.append(f"««/RUN{run_id}»»")
             
             # Store complete formatting data with merge info
             runs_data.append({
                 'id': run_id,
-                'format': asdict(run_format),
+                'format': run_format,  # Shared RunFormatting - read-only
                 'original_text': merged_text,
                 'marker': marker,
                 'merged_from_runs': original_run_indices,  # Track which runs were merged
                 'is_merged': len(group['runs']) > 1
             })
         
+        marked_text = "".join(marked_parts)
+        
+        para_format_sig = para_format.signature()
+        para_format_dict = self._para_format_cache.get(para_format_sig)
+        if para_format_dict is None:
+            para_format_dict = self._para_format_cache[para_format_sig] = asdict(para_format)
+        
         # Store complete paragraph data
         para_data = {
             'id': para_id,
-            'format': asdict(para_format),
+            'format': para_format_dict,  # Shared per distinct format - read-only
             'runs': runs_data,
+            'runs_by_id': {run_data['id']: run_data for run_data in runs_data},
             'marked_text': marked_text,
-            'checksum': hashlib.md5(marked_text.encode()).hexdigest(),
+            'checksum': hashlib.blake2b(marked_text.encode(), digest_size=8).hexdigest(),  # Integrity tag, not security
             'original_run_count': len(para.runs),  # Track original count
             'merged_run_count': len(merged_groups)  # Track merged count
         }
         
-        self.format_map[para_id] = para_data
-        
         return marked_text, para_data
     
-    def parse_translated_text(self, translated_text: str, para_id: int) -> List[Dict]:
-        """Parse translated text and extract run information"""
-        para_data = self.format_map.get(para_id)
+    def parse_translated_text(self, translated_text: str, para_id: int, para_data: Optional[Dict] = None) -> List[Dict]:
+        """
+        Parse translated text and extract run information.
+        para_data may be passed when the caller already fetched it from format_map.
+        """
+        if para_data is None:
+            para_data = self.format_map.get(para_id)
         if not para_data:
-            return [{'text': translated_text, 'format': {}}]
-        
-        # Pattern to match run markers - CRITICAL: Use re.DOTALL to match across newlines!
-        # The ([\s\S]*?) pattern matches any character including newlines
-        pattern = r'««RUN(\d+):[^»]+»»([\s\S]*?)««/RUN\1»»'
+            return [{'text': translated_text, 'format': None}]
         
+        # Single left-to-right pass. A run starts at a run open marker whose ««/RUNn»» follows
+        # (found with str.find) and its text is everything up to that closing marker - it may
+        # span newlines. Markers are dropped from run text and from the extra text between runs
+        # in the same walk, by scanning each span for markers once instead of slicing it out and
+        # cleaning it afterwards. Extra text between two runs (including the text of a run whose
+        # closing marker is missing) stays one extra run, whitespace and all, so words around a
+        # broken marker stay apart.
         parsed_runs = []
-        last_end = 0
+        pos = 0
+        text_len = len(translated_text)
+        
+        def without_markers(start: int, end: int) -> str:
+            """translated_text[start:end] with every marker in that span removed"""
+            if _ALL_MARKERS_RE.search(translated_text, start, end) is None:
+                return translated_text[start:end]
+            parts = []
+            for marker in _ALL_MARKERS_RE.finditer(translated_text, start, end):
+                parts.append(translated_text[start:marker.start()])
+                start = marker.end()
+            parts.append(translated_text[start:end])
+            return ''.join(parts)
         
-        for match in re.finditer(pattern, translated_text):
-            # Check if there's text before this run
-            if match.start() > last_end:
-                plain_text = translated_text[last_end:match.start()]
-                # Remove any markers that might be in plain text
-                plain_text = re.sub(r'««[^»]+»»', '', plain_text)
-                if plain_text.strip():
-                    # This shouldn't happen with proper translation
+        while pos < text_len:
+            # Next run open marker that has a matching closing marker
+            match = _RUN_OPEN_RE.search(translated_text, pos)
+            while match is not None:
+                closing = f'««/RUN{match.group(1)}»»'
+                close_at = translated_text.find(closing, match.end())
+                if close_at >= 0:
+                    break
+                match = _RUN_OPEN_RE.search(translated_text, match.start() + 1)
+            gap_end = match.start() if match is not None else text_len
+            
+            # Text outside any run - this shouldn't happen with proper translation
+            if gap_end > pos:
+                extra_text = without_markers(pos, gap_end)
+                if extra_text.strip():
                     parsed_runs.append({
-                        'text': plain_text,
-                        'format': {},
+                        'text': extra_text,
+                        'format': None,
                         'is_extra': True
                     })
+            if match is None:
+                break
             
             run_id = int(match.group(1))
-            run_text = match.group(2)
-            
-            # CRITICAL: Clean any nested or remaining markers from run text
-            run_text = re.sub(r'««[^»]+»»', '', run_text)
-            # Remove properly closed delimiter markers
-            run_text = re.sub(r'<<<[^>]*?>>>', '', run_text, flags=re.DOTALL)
-            # Remove malformed markers without closing >>>
-            run_text = re.sub(r'<<<[^\s]*', '', run_text)
-            run_text = re.sub(r'<<<.*?(?=\s|$)', '', run_text, flags=re.DOTALL)
+            run_text = without_markers(match.end(), close_at)
+            pos = close_at + len(closing)
             
             # Find original format
-            original_run = next((r for r in para_data['runs'] if r['id'] == run_id), None)
+            original_run = para_data['runs_by_id'].get(run_id)
             
             if original_run:
-                # Ensure format dictionary exists and is valid
-                format_dict = original_run.get('format', {})
-                if not isinstance(format_dict, dict):
-                    format_dict = {}
+                run_format = original_run['format']
                 
-                # Debug: Always log format dict for runs with I marker
-                print(f"[FORMAT DEBUG] Run ID {run_id}: italic={format_dict.get('italic')}, bold={format_dict.get('bold')}")
-                if format_dict.get('italic'):
+                # Debug: Always log format for runs with I marker
+                print(f"[FORMAT DEBUG] Run ID {run_id}: italic={run_format.italic}, bold={run_format.bold}")
+                if run_format.italic:
                     print(f"[FORMAT DEBUG] Run ID {run_id} HAS ITALIC=TRUE in stored format")
                 
                 parsed_runs.append({
                     'text': run_text,
-                    'format': format_dict,
+                    'format': run_format,
                     'run_id': run_id
                 })
             else:
@@ -842,42 +1181,18 @@ class RobustFormatPreserver:
                 print(f"[WARNING] Available run IDs: {available_ids}")
                 parsed_runs.append({
                     'text': run_text,
-                    'format': {},
+                    'format': None,
                     'is_error': True
                 })
-            
-            last_end = match.end()
-        
-        # Check for text after last run
-        if last_end < len(translated_text):
-            remaining = translated_text[last_end:]
-            # Remove any markers from remaining text
-            remaining = re.sub(r'««[^»]+»»', '', remaining)
-            # Remove properly closed delimiter markers
-            remaining = re.sub(r'<<<[^>]*?>>>', '', remaining, flags=re.DOTALL)
-            # Remove malformed markers without closing >>>
-            remaining = re.sub(r'<<<[^\s]*', '', remaining)
-            remaining = re.sub(r'<<<.*?(?=\s|$)', '', remaining, flags=re.DOTALL)
-            if remaining.strip():
-                parsed_runs.append({
-                    'text': remaining,
-                    'format': {},
-                    'is_extra': True
-                })
         
         # If no runs found, return plain text with all markers removed
         if not parsed_runs:
             # Aggressively remove all markers and return clean text
-            clean_text = re.sub(r'««[^»]+»»', '', translated_text)
-            # Remove properly closed delimiter markers
-            clean_text = re.sub(r'<<<[^>]*?>>>', '', clean_text, flags=re.DOTALL)
-            # Remove malformed markers without closing >>>
-            clean_text = re.sub(r'<<<[^\s]*', '', clean_text)
-            clean_text = re.sub(r'<<<.*?(?=\s|$)', '', clean_text, flags=re.DOTALL)
+            clean_text = _strip_all_markers(translated_text)
             # Also remove any partial markers that might remain
-            clean_text = re.sub(r'««.*', '', clean_text)
-            clean_text = re.sub(r'.*»»', '', clean_text)
-            return [{'text': clean_text, 'format': {}}]
+            clean_text = _PARTIAL_OPEN_RE.sub('', clean_text)
+            clean_text = _PARTIAL_CLOSE_RE.sub('', clean_text)
+            return [{'text': clean_text, 'format': None}]
         
         return parsed_runs
     
@@ -887,28 +1202,18 @@ class RobustFormatPreserver:
         print(f"[DEBUG APPLY] Translated text preview: {translated_text[:200] if len(translated_text) > 200 else translated_text}")
         
         # CRITICAL: Remove ALL delimiter markers first (catches any variations including translated/misspelled ones)
-        # First: Remove properly closed markers <<<...>>>
-        translated_text = re.sub(r'<<<[^>]*?>>>', '', translated_text, flags=re.DOTALL)
-        # Second: Remove MALFORMED markers that start with <<< but have no closing >>>
-        # Match <<< followed by ANY characters until whitespace or end of string
-        translated_text = re.sub(r'<<<[^\s]*', '', translated_text)
-        # Also catch any remaining <<< patterns (defensive)
-        translated_text = re.sub(r'<<<.*?(?=\s|$)', '', translated_text, flags=re.DOTALL)
+        # Closed <<<...>>> markers first, then MALFORMED ones with no closing >>>
+        translated_text = _strip_delimiter_markers(translated_text)
         
         para_data = self.format_map.get(para_id)
         print(f"[DEBUG APPLY] format_map has para_id={para_id}: {para_data is not None}")
         if para_data:
             print(f"[DEBUG APPLY] para_data['runs'] count: {len(para_data.get('runs', []))}")
             for run_info in para_data.get('runs', []):
-                print(f"[DEBUG APPLY]   Run ID {run_info['id']}: italic={run_info['format'].get('italic')}, bold={run_info['format'].get('bold')}")
+                print(f"[DEBUG APPLY]   Run ID {run_info['id']}: italic={run_info['format'].italic}, bold={run_info['format'].bold}")
         if not para_data:
             # No format data - remove any markers and set plain text
-            clean_text = re.sub(r'««[^»]+»»', '', translated_text)
-            # Remove properly closed markers
-            clean_text = re.sub(r'<<<[^>]*?>>>', '', clean_text, flags=re.DOTALL)
-            # Remove malformed markers without closing >>>
-            clean_text = re.sub(r'<<<[^\s]*', '', clean_text)
-            clean_text = re.sub(r'<<<.*?(?=\s|$)', '', clean_text, flags=re.DOTALL)
+            clean_text = _strip_all_markers(translated_text)
             for run in para.runs:
                 run.text = ""
             if para.runs:
@@ -918,22 +1223,13 @@ class RobustFormatPreserver:
             return
         
         # Parse translated text
-        parsed_runs = self.parse_translated_text(translated_text, para_id)
+        parsed_runs = self.parse_translated_text(translated_text, para_id, para_data)
         
         # CRITICAL: Clean all markers from run text (in case parsing missed some)
         for run_data in parsed_runs:
             if 'text' in run_data:
                 # Remove any remaining markers from the text (both robust and delimiter markers)
-                run_data['text'] = re.sub(r'««[^»]+»»', '', run_data['text'])
-                # Remove properly closed delimiter markers
-                run_data['text'] = re.sub(r'<<<[^>]*?>>>', '', run_data['text'], flags=re.DOTALL)
-                # Remove malformed markers without closing >>>
-                run_data['text'] = re.sub(r'<<<[^\s]*', '', run_data['text'])
-                run_data['text'] = re.sub(r'<<<.*?(?=\s|$)', '', run_data['text'], flags=re.DOTALL)
-        
-        # Clear existing runs
-        for run in para.runs:
-            run.text = ""
+                run_data['text'] = _strip_all_markers(run_data['text'])
         
         # Apply paragraph formatting
         para_format = para_data['format']
@@ -950,20 +1246,25 @@ class RobustFormatPreserver:
         if para_format.get('alignment') is not None:
             para.alignment = para_format['alignment']
         if para_format.get('left_indent') is not None:
-            para.paragraph_format.left_indent = Pt(para_format['left_indent'])
+            para.paragraph_format.left_indent = _pt_cached(para_format['left_indent'])
         if para_format.get('right_indent') is not None:
-            para.paragraph_format.right_indent = Pt(para_format['right_indent'])
+            para.paragraph_format.right_indent = _pt_cached(para_format['right_indent'])
         if para_format.get('first_line_indent') is not None:
-            para.paragraph_format.first_line_indent = Pt(para_format['first_line_indent'])
+            para.paragraph_format.first_line_indent = _pt_cached(para_format['first_line_indent'])
         if para_format.get('space_before') is not None:
-            para.paragraph_format.space_before = Pt(para_format['space_before'])
+            para.paragraph_format.space_before = _pt_cached(para_format['space_before'])
         if para_format.get('space_after') is not None:
-            para.paragraph_format.space_after = Pt(para_format['space_after'])
+            para.paragraph_format.space_after = _pt_cached(para_format['space_after'])
+        
+        # Existing runs are reused in place (their text is overwritten below);
+        # only the overflow is added or removed
+        existing_runs = para.runs
+        reuse_count = min(len(existing_runs), len(parsed_runs))
         
         # Create runs with formatting
         for i, run_data in enumerate(parsed_runs):
             # Final safety check: ensure text has no markers
-            clean_run_text = re.sub(r'««[^»]+»»', '', run_data.get('text', ''))
+            clean_run_text = _ANY_MARKER_RE.sub('', run_data.get('text', ''))
             
             # DEBUG: Log runs that might be Roman numerals
             stripped_before = clean_run_text.strip().upper()
@@ -978,12 +1279,12 @@ class RobustFormatPreserver:
             if clean_run_text_before != clean_run_text:
                 print(f"[ROMAN CONVERTED] Run {i}: '{clean_run_text_before}' → '{clean_run_text}'")
             
-            # Get format dictionary
-            fmt = run_data.get('format', {})
+            # Get run formatting (extra/unknown runs carry none)
+            fmt = run_data.get('format') or _UNFORMATTED_RUN
             
             # Create or reuse run
-            if i < len(para.runs):
-                run = para.runs[i]
+            if i < reuse_count:
+                run = existing_runs[i]
                 run.text = clean_run_text
                 
                 # CRITICAL: Reset all formatting properties when reusing runs
@@ -1011,85 +1312,32 @@ class RobustFormatPreserver:
             
             # Apply all formatting
             # DEBUG: Log what we're applying
-            print(f"[DEBUG APPLY RUN {i}] fmt.get('italic')={fmt.get('italic')}, fmt.get('bold')={fmt.get('bold')}, text={clean_run_text[:30] if len(clean_run_text) > 30 else clean_run_text}")
-            
-            # Basic formatting - only apply if value is explicitly True or False (not None)
-            if fmt.get('bold') is not None:
-                run.bold = fmt['bold']
-                print(f"[DEBUG APPLY RUN {i}] Set run.bold = {fmt['bold']}")
-            if fmt.get('italic') is not None:
-                run.italic = fmt['italic']
-                print(f"[DEBUG APPLY RUN {i}] Set run.italic = {fmt['italic']}")
-            if fmt.get('underline') is not None:
-                run.underline = fmt['underline']
-            if fmt.get('strike') is not None:
-                run.font.strike = fmt['strike']
-            if fmt.get('double_strike') is not None:
-                run.font.double_strike = fmt['double_strike']
-            if fmt.get('subscript') is not None:
-                run.font.subscript = fmt['subscript']
-            if fmt.get('superscript') is not None:
-                run.font.superscript = fmt['superscript']
+            print(f"[DEBUG APPLY RUN {i}] fmt.italic={fmt.italic}, fmt.bold={fmt.bold}, text={clean_run_text[:30] if len(clean_run_text) > 30 else clean_run_text}")
             
-            # Font properties
-            if fmt.get('font_name'):
-                run.font.name = fmt['font_name']
-            if fmt.get('font_size'):
-                # Use _safe_int to handle any float values stored
-                size_val = _safe_int(fmt['font_size'])
-                if size_val:
-                    run.font.size = Pt(size_val)
-            
-            # Color handling
-            if fmt.get('font_color'):
-                if str(fmt['font_color']).startswith('theme:'):
-                    # Theme color - would need special handling
-                    pass
+            # Only the properties this format actually sets (precomputed per signature)
+            for target, name, value in _run_apply_ops(fmt.signature()):
+                if target == 'run':
+                    setattr(run, name, value)
+                elif target == 'font':
+                    setattr(run.font, name, value)
                 else:
-                    try:
-                        # Parse RGB color - handle both int and float strings using _safe_int
-                        rgb_int = _safe_int(fmt['font_color'])
-                        
-                        # Validate RGB value is in valid range (0 to 16777215 = 0xFFFFFF)
-                        if rgb_int is not None and 0 <= rgb_int <= 16777215:
-                            run.font.color.rgb = RGBColor(
-                                (rgb_int >> 16) & 0xFF,
-                                (rgb_int >> 8) & 0xFF,
-                                rgb_int & 0xFF
-                            )
-                    except (ValueError, TypeError, OverflowError) as e:
-                        # Invalid color value - skip color setting
-                        pass
-            
-            # Advanced formatting
-            if fmt.get('all_caps') is not None:
-                run.font.all_caps = fmt['all_caps']
-            if fmt.get('small_caps') is not None:
-                run.font.small_caps = fmt['small_caps']
-            if fmt.get('shadow') is not None:
-                run.font.shadow = fmt['shadow']
-            if fmt.get('emboss') is not None:
-                run.font.emboss = fmt['emboss']
-            if fmt.get('imprint') is not None:
-                run.font.imprint = fmt['imprint']
-            if fmt.get('outline') is not None:
-                run.font.outline = fmt['outline']
+                    setattr(run.font.color, name, value)
+            if fmt.bold is not None:
+                print(f"[DEBUG APPLY RUN {i}] Set run.bold = {fmt.bold}")
+            if fmt.italic is not None:
+                print(f"[DEBUG APPLY RUN {i}] Set run.italic = {fmt.italic}")
             
-        # Remove any extra empty runs
-        while len(para.runs) > len(parsed_runs):
-            para._p.remove(para.runs[-1]._element)
+        # Remove leftover original runs in one pass
+        for run in existing_runs[len(parsed_runs):]:
+            para._p.remove(run._element)
         
         # CRITICAL: Ensure heading paragraphs are bold (fixes issue with cloned documents)
         ensure_heading_bold(para)
 
 
-def create_robust_translation_prompt(marked_texts: List[Tuple[int, str]], language: str) -> str:
-    """Create a prompt that ensures 100% format preservation"""
-    
-    prompt = f"""You are a professional translator with expertise in preserving complex document formatting.
-
-Translate the following {len(marked_texts)} passages into {language} with ABSOLUTE format preservation.
-
+# Static body of the robust translation prompt (everything after the header line),
+# kept as a constant so each prompt only formats the header and passages
+_PROMPT_TAIL = """
 🎯 CRITICAL: READING LEVEL & MODERNIZATION REQUIREMENT:
 
 **8TH GRADE READING LEVEL - MANDATORY:**
@@ -1485,17 +1733,65 @@ Before submitting your translation, verify:
 
 OUTPUT FORMAT:
 """
+
+
+def create_robust_translation_prompt(marked_texts: Iterable[Tuple[int, str]], language: str) -> str:
+    """
+    Create a prompt that ensures 100% format preservation.
+    marked_texts may be any iterable of (para_id, marked_text) pairs - it is consumed once,
+    so a generator lets extraction and prompt assembly happen in the same pass.
+    """
     
-    # Add passages
+    # Build passages first (single pass over marked_texts) so the header knows the count
+    passages = []
     for para_id, marked_text in marked_texts:
-        prompt += f"\nPassage {para_id}:\n"
-        prompt += f'"""\n{marked_text}\n"""\n'
-        prompt += f"\nOutput your translation for Passage {para_id} in this EXACT format:\n"
-        prompt += f"<<<TRANSLATION_{para_id}_START>>>\n"
-        prompt += "[Your translation with all RUN markers preserved - NO delimiter markers inside]\n"
-        prompt += f"<<<TRANSLATION_{para_id}_END>>>\n\n"
+        passages.append(
+            f"\nPassage {para_id}:\n"
+            f'"""\n{marked_text}\n"""\n'
+            f"\nOutput your translation for Passage {para_id} in this EXACT format:\n"
+            f"<<<TRANSLATION_{para_id}_START>>>\n"
+            "[Your translation with all RUN markers preserved - NO delimiter markers inside]\n"
+            f"<<<TRANSLATION_{para_id}_END>>>\n\n"
+        )
     
-    return prompt
+    header = (
+        "You are a professional translator with expertise in preserving complex document formatting.\n\n"
+        f"Translate the following {len(passages)} passages into {language} with ABSOLUTE format preservation.\n"
+    )
+    
+    # Static instructions are a module constant; only the header and passages vary per call
+    return "".join([header, _PROMPT_TAIL, *passages])
+
+
+def _is_plain_single_run(preserver: RobustFormatPreserver, para: Paragraph) -> bool:
+    """
+    True when the paragraph is exactly one run with no run properties (<w:rPr>)
+    and no case boundaries that the marker path would split into separate runs.
+    """
+    runs = para.runs
+    if len(runs) != 1 or runs[0]._r.rPr is not None:
+        return False
+    return not preserver._has_significant_case_change(runs[0].text)
+
+
+def _translations_to_list(translations, count: int) -> List[Optional[str]]:
+    """
+    Normalize translate_func output to a positional list of length count (None = no translation).
+    Passage ids outside 0..count-1 are logged and skipped.
+    """
+    if isinstance(translations, list):
+        if len(translations) == count:
+            return translations
+        print(f"[WARNING] Got {len(translations)} translations for {count} passages - "
+              f"extra entries are ignored, missing ones left untranslated")
+        return translations[:count] + [None] * (count - len(translations))
+    translations_list = [None] * count
+    for idx, translation in translations.items():
+        if not isinstance(idx, int) or not 0 <= idx < count:
+            print(f"[WARNING] Ignoring translation for unknown passage id {idx!r} ({count} passages)")
+            continue
+        translations_list[idx] = translation
+    return translations_list
 
 
 def integrate_robust_preservation(doc: Document, paragraphs_to_translate: List[Tuple[int, Paragraph]], 
@@ -1505,25 +1801,33 @@ def integrate_robust_preservation(doc: Document, paragraphs_to_translate: List[T
     # Initialize preserver
     preserver = RobustFormatPreserver(doc)
     
-    # Extract formatting and create marked texts
-    marked_texts = []
-    para_mapping = {}
+    # FAST PATH: most body paragraphs are a single run with no run formatting.
+    # Those are sent as raw text (no RUN markers) and written straight back.
+    simple = [_is_plain_single_run(preserver, para) for _, para in paragraphs_to_translate]
     
-    for idx, (para_idx, para) in enumerate(paragraphs_to_translate):
-        marked_text, para_data = preserver.create_formatted_text_for_translation(para, idx)
-        marked_texts.append((idx, marked_text))
-        para_mapping[idx] = (para_idx, para)
+    # Extract formatting and create marked texts lazily - the prompt builder
+    # consumes them in the same pass, so no intermediate list is kept
+    marked_texts = (
+        (idx, para.runs[0].text if simple[idx]
+         else preserver.create_formatted_text_for_translation(para, idx)[0])
+        for idx, (_, para) in enumerate(paragraphs_to_translate)
+    )
     
     # Create translation prompt
     prompt = create_robust_translation_prompt(marked_texts, language)
     
     # Get translations (this would call your API)
+    # translate_func may return a list indexed by passage id, or a {passage_id: text} dict
     translations = translate_func(prompt)
+    translations_list = _translations_to_list(translations, len(paragraphs_to_translate))
     
     # Parse and apply translations
+    # Passage ids are positions in paragraphs_to_translate, so walk them in order
     results = {}
-    for idx, translation in translations.items():
-        para_idx, para = para_mapping[idx]
+    for idx, translation in enumerate(translations_list):
+        if translation is None:
+            continue
+        para_idx, para = paragraphs_to_translate[idx]
         
         # Clean translation (remove markers from response format)
         clean_translation = translation
@@ -1531,6 +1835,14 @@ def integrate_robust_preservation(doc: Document, paragraphs_to_translate: List[T
         clean_translation = re.sub(f'<<<TRANSLATION_{idx}_END>>>', '', clean_translation)
         clean_translation = clean_translation.strip()
         
+        if simple[idx]:
+            # Single plain run - no formatting to restore, just replace the text
+            plain_text = _strip_all_markers(clean_translation)
+            para.runs[0].text = convert_roman_numerals_in_text(plain_text)
+            ensure_heading_bold(para)
+            results[para_idx] = clean_translation
+            continue
+        
         # Apply formatting
         preserver.apply_formatting_to_paragraph(para, idx, clean_translation)
         
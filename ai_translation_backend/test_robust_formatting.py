@@ -44,7 +44,16 @@ try:
     prompt = create_robust_translation_prompt([(0, marked_text)], "Spanish")
     print(f"✅ Prompt creation works!")
     print(f"   Prompt length: {len(prompt)} characters")
-    
+
+    # Test parsing a translation whose last run marker was never closed:
+    # the text after the broken marker must keep its leading space
+    parsed = preserver.parse_translated_text("««RUN0:B»»Hola««/RUN0»» ««RUN2:I»»mundo", 0)
+    parsed_text = ''.join(run['text'] for run in parsed)
+    assert parsed_text == "Hola mundo", f"Unclosed run marker parsed as {parsed_text!r}"
+    assert parsed[0].get('run_id') == 0 and parsed[-1].get('is_extra'), parsed
+    print(f"✅ Unclosed run marker parsing works!")
+    print(f"   Parsed text: {parsed_text}")
+
     print("\n🎉 All robust formatting features are working correctly!")
     print("✅ Backend is ready to use robust formatting!")
     
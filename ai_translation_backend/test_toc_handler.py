@@ -0,0 +1,95 @@
+"""
+Quick test to verify TOC detection and title matching
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_doc(texts):
+    """Document with one paragraph per text"""
+    doc = Document()
+    for text in texts:
+        doc.add_paragraph(text)
+    return doc
+
+
+def matched_texts(doc, titles, start_index=0):
+    return [(idx, para.text) for idx, para in find_matching_paragraphs(doc, titles, start_index)]
+
+
+try:
+    from docx import Document
+    from toc_handler import (
+        detect_toc_in_first_pages,
+        find_matching_paragraphs,
+        process_toc_before_translation,
+        RAPIDFUZZ_AVAILABLE
+    )
+    print("✅ TOC handler module imported successfully!")
+
+    # Only a short paragraph can be a TOC heading; body text that mentions "contents" is not
+    doc = make_doc(['The contents of this chapter were revised for the second edition.',
+                    'Introduction\t1', 'Methods\t5', 'Body text'])
+    toc_paragraphs, _ = detect_toc_in_first_pages(doc)
+    assert toc_paragraphs == [], f"Long paragraph started a TOC: {[text for _, _, text in toc_paragraphs]}"
+    doc = make_doc(['Table of Contents', 'Introduction\t1', 'Methods\t5', 'Body text'])
+    toc_paragraphs, _ = detect_toc_in_first_pages(doc)
+    assert [text for _, _, text in toc_paragraphs] == ['Introduction\t1', 'Methods\t5'], toc_paragraphs
+    print(f"✅ TOC heading detection works!")
+    print(f"   Entries: {len(toc_paragraphs)}")
+
+    # Titles are matched in document order: a repeated title maps to its successive headings
+    doc = make_doc(['Intro', 'Part A', 'Introduction', 'Body', 'Part B', 'Introduction', 'End'])
+    matches = matched_texts(doc, ['Part A', 'Introduction', 'Part B', 'Introduction'])
+    assert matches == [(1, 'Part A'), (2, 'Introduction'), (4, 'Part B'), (5, 'Introduction')], \
+        f"Repeated titles matched {matches}"
+    # ...but a body paragraph that merely starts with the title, close to the previous
+    # match, must not beat the exact heading further away
+    doc = make_doc(['Introduction', 'The long road was empty when we set out']
+                   + [f'Filler paragraph {i}' for i in range(600)] + ['The Long Road'])
+    matches = matched_texts(doc, ['Introduction', 'The Long Road'])
+    assert matches == [(0, 'Introduction'), (602, 'The Long Road')], f"In-order titles matched {matches}"
+    print(f"✅ In-order title matching works!")
+
+    # Titles and paragraphs are casefolded, so 'Straße' in the TOC matches 'STRASSE' in the text
+    doc = make_doc(['Inhaltsverzeichnis', 'Einleitung\t1', 'Die Straße\t3',
+                    'EINLEITUNG', 'Text', 'DIE STRASSE', 'Mehr Text'])
+    results = process_toc_before_translation(doc)
+    headings = [para.text for para in doc.paragraphs if para.style.name == 'Heading 2']
+    assert results['paragraphs_converted'] == 2 and headings == ['EINLEITUNG', 'DIE STRASSE'], \
+        f"Casefolded titles converted {headings}"
+    print(f"✅ Casefolded TOC processing works!")
+    print(f"   Headings: {headings}")
+
+    # Fuzzy fallback: numbered titles must not land on a neighbouring number, and a
+    # paragraph already matched to one title is not matched again
+    doc = make_doc(['Contents', 'Chapter 10\t3', 'Chapter 11\t9', 'Chapter 10', 'Body text',
+                    'Appendix A - Tables', 'More body text'])
+    matches = matched_texts(doc, ['Chapter 10', 'Chapter 11', 'Appendix B - Tables'], start_index=3)
+    assert matches == [(3, 'Chapter 10')], f"Numbered titles matched {matches}"
+    print(f"✅ Numbered titles are not fuzzy-matched to other numbers!")
+    print(f"   Matches: {matches}")
+
+    if RAPIDFUZZ_AVAILABLE:
+        # A near-miss (trailing period, ß vs ss) still reaches the right heading
+        doc = make_doc(['Intro', 'Die Strasse', 'Chapter Twelve: The Endd', 'Outro'])
+        matches = matched_texts(doc, ['Die Straße.', 'Chapter Twelve: The End.'])
+        assert matches == [(1, 'Die Strasse'), (2, 'Chapter Twelve: The Endd')], f"Fuzzy titles matched {matches}"
+        print(f"✅ Fuzzy title matching works!")
+        print(f"   Matches: {matches}")
+
+    print("\n🎉 All TOC handler checks passed!")
+
+except ImportError as e:
+    print(f"❌ Import error: {e}")
+    print("   Make sure toc_handler.py is in the backend directory")
+    sys.exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
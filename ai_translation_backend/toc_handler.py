@@ -4,23 +4,137 @@ Detects TOC entries, extracts titles, and converts matching paragraphs to Headin
 """
 
 import re
-from typing import List, Tuple, Optional
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, List, Tuple, Optional
 from docx.text.paragraph import Paragraph
 from docx.oxml.ns import qn
 from docx.shared import Pt
 
+# Optional: typo-tolerant title matching (C++ Levenshtein). Without it, titles that
+# differ from the heading text by a typo/translation drift are simply left unmatched.
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
-def detect_toc_in_first_pages(doc, max_pages: int = 10) -> Tuple[List[Paragraph], int]:
+# Minimum rapidfuzz ratio (0-100) for the fuzzy fallback. Kept high: a false positive
+# turns a body paragraph into a Heading 2.
+_FUZZY_MATCH_CUTOFF = 90
+# Numbers, roman numerals and single letters ('chapter 11', 'part iv', 'appendix b'). Titles
+# that differ only in these score above the cutoff but are different headings, so a fuzzy
+# hit must carry the same ones as the title.
+_NUMERAL_TOKEN_RE = re.compile(
+    r'\b(?=\w)(?:\d+|[a-z]|m{0,3}(?:cm|cd|d?c{0,3})(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3}))(?<=\w)\b'
+)
+
+# How many candidate paragraphs past the previous match to search before falling back
+# to searching the whole document for a title
+_IN_ORDER_WINDOW = 500
+
+
+# TOC heading keywords, longest phrases first so the more specific keyword is the one reported
+_TOC_KEYWORDS = (
+    'table of contents', 'table des matières', 'tabla de contenidos', 'índice de contenidos',
+    'inhaltsverzeichnis', 'sommaire', 'contenido', 'contents', 'índice',
+)
+# One alternation instead of a substring scan per keyword
+_TOC_KEYWORD_RE = re.compile('|'.join(map(re.escape, _TOC_KEYWORDS)))
+# TOC headings are short ("Table of Contents", "Índice de contenidos"). Longer paragraphs
+# that merely mention a keyword are body text, and skipping them avoids scanning them at all.
+_MAX_TOC_HEADING_LEN = 40
+
+# TOC-end heuristics (detect_toc_in_first_pages)
+_TAB_THEN_NUMBER_RE = re.compile(r'\t.*\d+')
+_TRAILING_PAGE_NUMBER_RE = re.compile(r'\s{3,}\d+\s*$')
+
+# TOC entry patterns (is_toc_entry)
+_TOC_TAB_NUM_RE = re.compile(r'\t+\d+')
+_TOC_TRAIL_NUM_RE = re.compile(r'[A-Za-z].{5,}\s{3,}\d+\s*$')
+_TOC_LEADER_RE = re.compile(r'[A-Za-z].{5,}\.{2,}\d+')
+_TOC_FIELD_RE = re.compile(r'TOC\s+\\[a-z]', re.IGNORECASE)
+_DIGIT_RE = re.compile(r'\d')
+# Paragraphs classified per _scan_toc_entry_texts call during detection. A TOC usually ends
+# a few dozen paragraphs after its heading, so the texts are scanned a chunk at a time.
+_TOC_SCAN_CHUNK = 50
+# The four text-only patterns above as one alternation over NUL-joined paragraph texts:
+# '.' becomes [^\x00\n] and '$' becomes "before NUL or end", so no match crosses paragraphs
+_TOC_ENTRY_SCAN_RE = re.compile(
+    r'\t+\d+'
+    r'|[A-Za-z][^\x00\n]{5,}\s{3,}\d+\s*(?=\x00|\Z)'
+    r'|[A-Za-z][^\x00\n]{5,}\.{2,}\d+'
+    r'|(?i:TOC\s+\\[a-z])'
+)
+
+# Title cleanup (extract_toc_titles / find_matching_paragraphs)
+# TOC field codes ("TOC \\o "1-3"") and bare field switches ("\\h") in one pass
+_FIELD_CODE_RE = re.compile(r'(?:TOC\s+)?\\[a-z]+(?:\s+"[^"]*")?', re.IGNORECASE)
+_PAGE_NUMBER_RE = re.compile(r'\s*\d+\s*$')
+_WHITESPACE_RE = re.compile(r'\s+')
+_LEADER_DOTS_RE = re.compile(r'\.{3,}')
+
+
+def _first_paragraphs(doc, count: int) -> List[Paragraph]:
+    """
+    doc.paragraphs[:count] without wrapping every paragraph in the document first.
+    Same order and indices: both walk the <w:p> children of the body.
+    """
+    return [Paragraph(p, doc._body) for p in islice(doc.element.body.iterchildren(qn('w:p')), count)]
+
+
+@dataclass
+class _TextCache:
+    """
+    Paragraph texts of a document (from the first paragraph on), read and normalized once
+    and shared by TOC detection and title matching.
+    
+    casefold rather than lower, so e.g. 'STRASSE' and 'Straße' compare equal.
+    """
+    texts: List[str] = field(default_factory=list)   # para.text.strip()
+    lowers: List[str] = field(default_factory=list)  # casefolded
+    cleans: List[str] = field(default_factory=list)  # casefolded, whitespace runs collapsed to one space
+    
+    @classmethod
+    def from_paragraphs(cls, paragraphs: Iterable[Paragraph]) -> '_TextCache':
+        cache = cls()
+        cache.extend(paragraphs)
+        return cache
+    
+    def extend(self, paragraphs: Iterable[Paragraph]) -> None:
+        """Append the texts of the paragraphs that follow the ones already cached"""
+        for para in paragraphs:
+            text = para.text.strip()
+            lower = text.casefold()
+            self.texts.append(text)
+            self.lowers.append(lower)
+            self.cleans.append(_WHITESPACE_RE.sub(' ', lower))
+
+
+def detect_toc_in_first_pages(doc, max_pages: int = 10,
+                              paragraphs: Optional[List[Paragraph]] = None) -> Tuple[List[Paragraph], int]:
     """
     Detect Table of Contents entries in the first N pages of the document.
     
     Args:
         doc: The document to search
         max_pages: Maximum number of pages to search (default: 10)
+        paragraphs: doc.paragraphs, if the caller already has it (building it walks the whole body)
         
     Returns:
         Tuple of (list of TOC paragraphs, index where TOC ends)
     """
+    toc_paragraphs, toc_end_index, _ = _detect_toc(doc, max_pages, paragraphs)
+    return toc_paragraphs, toc_end_index
+
+
+def _detect_toc(doc, max_pages: int, paragraphs: Optional[List[Paragraph]],
+                cache: Optional[_TextCache] = None) -> Tuple[List[Paragraph], int, int]:
+    """
+    detect_toc_in_first_pages, also returning the TOC heading's index (-1 if there is none).
+    cache must cover at least the searched paragraphs.
+    """
     # Estimate paragraphs per page (rough estimate: ~50 paragraphs per page)
     max_paragraphs = max_pages * 50
     
@@ -28,19 +142,32 @@ def detect_toc_in_first_pages(doc, max_pages: int = 10) -> Tuple[List[Paragraph]
     toc_started = False
     toc_ended = False
     toc_end_index = -1
+    toc_heading_index = -1
+    # Whether a paragraph style id resolves to a Heading style. para.style searches the
+    # style definitions on every access, and a document only uses a few style ids.
+    heading_style_ids = {}
+    # Indices of paragraphs matching a text-only TOC entry pattern, found a chunk of
+    # paragraphs at a time (indices below scanned_until have been scanned)
+    entry_hits = set()
+    scanned_until = 0
+    
+    if paragraphs is None:
+        paragraphs = _first_paragraphs(doc, max_paragraphs)
+    else:
+        paragraphs = paragraphs[:max_paragraphs]
+    if cache is None:
+        cache = _TextCache.from_paragraphs(paragraphs)
+    texts = cache.texts[:len(paragraphs)]
     
-    for i, para in enumerate(doc.paragraphs[:max_paragraphs]):
-        text = para.text.strip()
+    for i, para in enumerate(paragraphs):
+        text = texts[i]
         
         # Check if this is a TOC heading
         if not toc_started:
-            text_lower = text.lower()
-            if any(keyword in text_lower for keyword in [
-                'table of contents', 'contents', 'table des matières',
-                'tabla de contenidos', 'índice', 'contenido', 'índice de contenidos',
-                'sommaire', 'inhaltsverzeichnis'
-            ]):
+            text_lower = cache.lowers[i]
+            if len(text_lower) <= _MAX_TOC_HEADING_LEN and _TOC_KEYWORD_RE.search(text_lower):
                 toc_started = True
+                toc_heading_index = i
                 continue
         
         if not toc_started:
@@ -55,26 +182,68 @@ def detect_toc_in_first_pages(doc, max_pages: int = 10) -> Tuple[List[Paragraph]
             if text and len(text) > 0:
                 # Check if this looks like a chapter heading (not a TOC entry)
                 if (text.isupper() and 3 < len(text) < 100 and 
-                    not re.search(r'\t.*\d+', text) and  # No tab + number pattern
-                    not re.search(r'\s{3,}\d+\s*$', text)):  # No trailing page number
+                    not _TAB_THEN_NUMBER_RE.search(text) and  # No tab + number pattern
+                    not _TRAILING_PAGE_NUMBER_RE.search(text)):  # No trailing page number
                     toc_ended = True
                     toc_end_index = i
                     break
                 
                 # Check if it has a Heading style
-                try:
-                    if para.style and para.style.name and para.style.name.startswith('Heading'):
-                        toc_ended = True
-                        toc_end_index = i
-                        break
-                except:
-                    pass
+                style_id = para._p.style
+                is_heading = heading_style_ids.get(style_id)
+                if is_heading is None:
+                    try:
+                        style = para.style
+                        is_heading = bool(style and style.name and style.name.startswith('Heading'))
+                    except:
+                        is_heading = False
+                    heading_style_ids[style_id] = is_heading
+                if is_heading:
+                    toc_ended = True
+                    toc_end_index = i
+                    break
         
-        # Detect TOC entry patterns
-        if is_toc_entry(para, text):
+        # Detect TOC entry patterns (same result as is_toc_entry(para, text))
+        if i >= scanned_until:
+            scanned_until = min(i + _TOC_SCAN_CHUNK, len(texts))
+            entry_hits = _scan_toc_entry_texts(texts, i, scanned_until)
+        if i in entry_hits or (len(text) >= 3 and _has_hyperlink_with_digit(para, text)):
             toc_paragraphs.append((i, para, text))
     
-    return toc_paragraphs, toc_end_index
+    return toc_paragraphs, toc_end_index, toc_heading_index
+
+
+def _scan_toc_entry_texts(texts: List[str], start: int, stop: Optional[int] = None) -> set:
+    """
+    Indices start <= i < stop (default: to the end) whose texts[i] matches
+    _is_toc_entry_text_only, found with a single regex pass over the texts joined by NUL
+    separators instead of per-paragraph regex calls. Texts are expected to be stripped,
+    like detect_toc_in_first_pages passes them.
+    """
+    if stop is None:
+        stop = len(texts)
+    # Only texts that pass the digit/backslash prefilter go into the buffer; no pattern
+    # crosses a NUL, so leaving the others out cannot change what matches
+    indices = [i for i in range(start, stop) if _may_be_toc_entry(texts[i])]
+    offsets = []
+    position = 0
+    for i in indices:
+        offsets.append(position)
+        position += len(texts[i]) + 1
+    
+    buffer = '\x00'.join([texts[i] for i in indices])
+    return {
+        indices[bisect_right(offsets, match.start()) - 1]
+        for match in _TOC_ENTRY_SCAN_RE.finditer(buffer)
+    }
+
+
+def _may_be_toc_entry(text: str) -> bool:
+    """
+    Cheap prefilter for the text-only TOC entry patterns: patterns 1-3 all need a page
+    number, so without a digit only a TOC field code (which needs a backslash) can match
+    """
+    return '\\' in text or _DIGIT_RE.search(text) is not None
 
 
 def is_toc_entry(para: Paragraph, text: str) -> bool:
@@ -90,33 +259,43 @@ def is_toc_entry(para: Paragraph, text: str) -> bool:
     if not text or len(text.strip()) < 3:
         return False
     
+    return _is_toc_entry_text_only(text) or _has_hyperlink_with_digit(para, text)
+
+
+def _is_toc_entry_text_only(text: str) -> bool:
+    """The text-only TOC entry patterns (detection uses the equivalent _scan_toc_entry_texts)"""
+    if not _may_be_toc_entry(text):
+        return False
+    
     # Pattern 1: Tab followed by digits (classic TOC pattern)
-    if '\t' in text and re.search(r'\t+\d+', text):
+    if '\t' in text and _TOC_TAB_NUM_RE.search(text):
         return True
     
     # Pattern 2: Multiple spaces followed by trailing number
-    if re.search(r'[A-Za-z].{5,}\s{3,}\d+\s*$', text):
+    if _TOC_TRAIL_NUM_RE.search(text):
         return True
     
     # Pattern 3: Dots/leaders followed by number
-    if re.search(r'[A-Za-z].{5,}\.{2,}\d+', text):
+    if _TOC_LEADER_RE.search(text):
         return True
     
-    # Pattern 4: Check for hyperlink in XML
-    try:
-        hyperlinks = list(para._p.iter(qn('w:hyperlink')))
-        if hyperlinks and re.search(r'\d', text):
-            return True
-    except:
-        pass
-    
     # Pattern 5: Check for TOC field codes
-    if re.search(r'TOC\s+\\[a-z]', text, re.IGNORECASE):
+    if _TOC_FIELD_RE.search(text):
         return True
     
     return False
 
 
+def _has_hyperlink_with_digit(para: Paragraph, text: str) -> bool:
+    """Pattern 4: hyperlink in the paragraph XML plus a digit in the text (not cacheable - needs para)"""
+    if not _DIGIT_RE.search(text):
+        return False
+    try:
+        return next(para._p.iter(qn('w:hyperlink')), None) is not None
+    except:
+        return False
+
+
 def extract_toc_titles(toc_paragraphs: List[Tuple[int, Paragraph, str]]) -> List[str]:
     """
     Extract clean titles from TOC entries.
@@ -133,27 +312,24 @@ def extract_toc_titles(toc_paragraphs: List[Tuple[int, Paragraph, str]]) -> List
     
     for para_idx, para, text in toc_paragraphs:
         # Remove TOC field codes
-        text = re.sub(r'TOC\s+\\[a-z]+(\s+"[^"]*")?', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\\[a-z]+(\s+"[^"]*")?', '', text, flags=re.IGNORECASE)
+        text = _FIELD_CODE_RE.sub('', text)
         
-        # Remove page numbers (trailing digits)
-        text = re.sub(r'\s*\d+\s*$', '', text)
+        # Remove page numbers (trailing digits) - only once field codes are gone,
+        # since a trailing switch would otherwise hide the number from the $ anchor
+        text = _PAGE_NUMBER_RE.sub('', text)
         
-        # Remove tabs and extra whitespace
-        text = re.sub(r'\t+', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Collapse tabs and extra whitespace
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         # Remove duplicate patterns (e.g., "Title Title" -> "Title")
+        # (words contain no spaces, so the halves can only match with an even word count)
         words = text.split()
-        if len(words) >= 2:
-            mid = len(words) // 2
-            first_half = ' '.join(words[:mid])
-            second_half = ' '.join(words[mid:])
-            if first_half == second_half:
-                text = first_half
+        n = len(words)
+        if n >= 2 and n % 2 == 0 and words[:n // 2] == words[n // 2:]:
+            text = ' '.join(words[:n // 2])
         
         # Clean up any remaining artifacts
-        text = re.sub(r'\.{3,}', '', text)  # Remove leader dots
+        text = _LEADER_DOTS_RE.sub('', text)  # Remove leader dots
         text = text.strip()
         
         if text and len(text) > 2:
@@ -162,7 +338,9 @@ def extract_toc_titles(toc_paragraphs: List[Tuple[int, Paragraph, str]]) -> List
     return titles
 
 
-def find_matching_paragraphs(doc, titles: List[str], start_index: int = 0) -> List[Tuple[int, Paragraph]]:
+def find_matching_paragraphs(doc, titles: List[str], start_index: int = 0,
+                             paragraphs: Optional[List[Paragraph]] = None,
+                             cache: Optional[_TextCache] = None) -> List[Tuple[int, Paragraph]]:
     """
     Find paragraphs in the document that match TOC titles.
     
@@ -170,59 +348,140 @@ def find_matching_paragraphs(doc, titles: List[str], start_index: int = 0) -> Li
     - Case differences
     - Extra whitespace
     - Partial matches
+    - Near-identical text (typos), when rapidfuzz is installed
     
     Args:
         doc: The document to search
         titles: List of titles to match
         start_index: Only search paragraphs starting from this index (to skip TOC and content before it)
+        paragraphs: doc.paragraphs, if the caller already has it
+        cache: The texts of those paragraphs, if the caller already has them
+    
+    Titles are matched in TOC order: each title is looked for first in the paragraphs
+    following the previous title's match, then in the whole document.
     
     Returns list of (paragraph_index, paragraph) tuples.
     """
+    # Normalize every candidate paragraph ONCE (not once per title).
+    # Only search paragraphs AFTER the start_index (after TOC)
+    candidates = []  # (index, paragraph, whitespace-normalized casefolded text)
+    exact = {}  # text -> position (in candidates) of the first paragraph with that text
+    if paragraphs is None:
+        paragraphs = doc.paragraphs
+    if cache is None:
+        cache = _TextCache.from_paragraphs(paragraphs)
+    for i in range(start_index, len(paragraphs)):
+        para_lower = cache.cleans[i]
+        if not para_lower:
+            continue
+        candidates.append((i, paragraphs[i], para_lower))
+        exact.setdefault(para_lower, len(candidates) - 1)
+    
+    # Texts sorted lexicographically: all texts starting with a prefix form one contiguous block
+    by_text = sorted((para_lower, pos) for pos, (_, _, para_lower) in enumerate(candidates))
+    sorted_texts = [text for text, _ in by_text]
+    
+    def first_starting_with(prefix: str) -> Optional[int]:
+        """Position (in candidates) of the earliest paragraph starting with prefix"""
+        first = None
+        for k in range(bisect_left(sorted_texts, prefix), len(sorted_texts)):
+            if not sorted_texts[k].startswith(prefix):
+                break
+            if first is None or by_text[k][1] < first:
+                first = by_text[k][1]
+        return first
+    
+    # Containment fallback: one str.find over all candidate texts joined by '\n'. The texts
+    # are whitespace-normalized, so they contain no '\n' and a hit never spans two paragraphs;
+    # the first hit is the earliest containing paragraph. Built on first use.
+    joined = None
+    offsets = []
+    
+    def first_containing(needle: str) -> Optional[int]:
+        """Position (in candidates) of the earliest paragraph containing needle"""
+        nonlocal joined
+        if joined is None:
+            position = 0
+            for _, _, para_lower in candidates:
+                offsets.append(position)
+                position += len(para_lower) + 1
+            joined = '\n'.join(para_lower for _, _, para_lower in candidates)
+        hit = joined.find(needle)
+        return bisect_right(offsets, hit) - 1 if hit >= 0 else None
+    
+    def window_matches(lo: int, title_lower: str, long_title: bool) -> List[Optional[int]]:
+        """
+        Earliest position of each kind of match in the window of candidates starting at lo:
+        [exact, starts with the title, starts with its first 50 chars, contains it]
+        """
+        found = [None, None, None, None]
+        prefix = title_lower[:50] if len(title_lower) > 50 else None
+        for pos in range(lo, min(lo + _IN_ORDER_WINDOW, len(candidates))):
+            para_lower = candidates[pos][2]
+            if para_lower == title_lower:
+                found[0] = pos
+                break
+            if para_lower.startswith(title_lower):
+                kind = 1
+            elif prefix is not None and para_lower.startswith(prefix):
+                kind = 2
+            elif long_title and title_lower in para_lower:
+                kind = 3
+            else:
+                continue
+            if found[kind] is None:
+                found[kind] = pos
+        return found
+    
     matches = []
+    matched = set()  # Positions (in candidates) already matched to a title
+    choices = None  # Unmatched candidate texts by position for the fuzzy fallback, built on first use
+    cursor = 0  # Position (in candidates) just past the previous title's match
     
     for title in titles:
-        title_clean = re.sub(r'\s+', ' ', title.strip())
-        title_lower = title_clean.lower()
+        title_clean = _WHITESPACE_RE.sub(' ', title.strip())
+        title_lower = title_clean.casefold()
+        long_title = len(title_clean) >= 10
         
-        best_match = None
-        best_score = 0
+        # Exact match (case-insensitive) - the first one wins outright.
+        # Otherwise the earliest paragraph with the highest score:
+        #   90 - starts with the title (titles of 10+ chars)
+        #   80 - starts with the title's first 50 chars
+        #   70 - contains the title (titles of 10+ chars)
+        # TOC titles appear in document order, so for each kind of match the paragraphs just past
+        # the previous match are tried before the whole document; a weaker match nearby never
+        # beats a stronger one further away.
+        window = window_matches(cursor, title_lower, long_title)
+        pos = window[0] if window[0] is not None else exact.get(title_lower)
+        if pos is None:
+            pos = window[1] if window[1] is not None else first_starting_with(title_lower)
+        if pos is None and len(title_lower) > 50:
+            pos = window[2] if window[2] is not None else first_starting_with(title_lower[:50])
+        if pos is None and long_title:
+            pos = window[3] if window[3] is not None else first_containing(title_lower)
         
-        # Only search paragraphs AFTER the start_index (after TOC)
-        for i, para in enumerate(doc.paragraphs[start_index:], start=start_index):
-            para_text = para.text.strip()
-            if not para_text:
-                continue
-            
-            para_clean = re.sub(r'\s+', ' ', para_text)
-            para_lower = para_clean.lower()
-            
-            # Exact match (case-insensitive)
-            if para_lower == title_lower:
-                best_match = (i, para)
-                best_score = 100
-                break
-            
-            # Check if title is contained in paragraph (for longer paragraphs)
-            if title_lower in para_lower and len(title_clean) >= 10:
-                # Prefer matches at the start of the paragraph
-                if para_lower.startswith(title_lower):
-                    score = 90
-                else:
-                    score = 70
-                
-                if score > best_score:
-                    best_match = (i, para)
-                    best_score = score
-            
-            # Check if paragraph starts with title (for shorter matches)
-            if para_lower.startswith(title_lower[:min(50, len(title_lower))]):
-                score = 80
-                if score > best_score:
-                    best_match = (i, para)
-                    best_score = score
+        # Last resort: closest paragraph by edit distance (titles of 10+ chars only).
+        # Both sides are casefolded, so 'ß' vs 'ss' costs nothing here: with .lower(),
+        # 'die strasse' vs 'die straße' scores ~86 and would miss the cutoff.
+        # Paragraphs already matched to another title are not candidates, and 'chapter 11'
+        # must not land on 'chapter 1' or 'chapter 10' (see _NUMERAL_TOKEN_RE).
+        if pos is None and long_title and RAPIDFUZZ_AVAILABLE:
+            if choices is None:
+                choices = {k: para_lower for k, (_, _, para_lower) in enumerate(candidates)
+                           if k not in matched}
+            numerals = _NUMERAL_TOKEN_RE.findall(title_lower)
+            for _, _, k in process.extract(title_lower, choices, scorer=fuzz.ratio, limit=None,
+                                           score_cutoff=_FUZZY_MATCH_CUTOFF, processor=None):
+                if _NUMERAL_TOKEN_RE.findall(choices[k]) == numerals:
+                    pos = k
+                    break
         
-        if best_match and best_score >= 70:
-            matches.append(best_match)
+        if pos is not None:
+            matches.append(candidates[pos][:2])
+            matched.add(pos)
+            if choices is not None:
+                choices.pop(pos, None)
+            cursor = pos + 1
     
     return matches
 
@@ -233,21 +492,24 @@ def convert_to_heading_2(doc, matches: List[Tuple[int, Paragraph]]) -> int:
     
     Returns: count of paragraphs converted
     """
-    converted_count = 0
+    # Resolve the style once: Heading 2, else Heading 1, else there is nothing to convert to.
+    # styles[...] (unlike `in`) also falls back to a style whose id is the key.
+    try:
+        target_style = doc.styles['Heading 2']
+    except KeyError:
+        try:
+            target_style = doc.styles['Heading 1']
+        except KeyError:
+            return 0
     
+    converted_count = 0
     for para_idx, para in matches:
         try:
-            # Set to Heading 2 style
-            para.style = doc.styles['Heading 2']
+            para.style = target_style
             converted_count += 1
-        except (KeyError, AttributeError):
-            # If Heading 2 doesn't exist, try to create it or use Heading 1
-            try:
-                para.style = doc.styles['Heading 1']
-                converted_count += 1
-            except:
-                # If no heading styles exist, skip
-                pass
+        except Exception:
+            # Skip a paragraph whose style can't be set
+            pass
     
     return converted_count
 
@@ -258,11 +520,10 @@ def remove_toc_paragraphs(doc, toc_paragraphs: List[Tuple[int, Paragraph, str]])
     
     Returns: count of paragraphs removed
     """
-    # Sort by index in reverse order to avoid index shifting issues
-    sorted_toc = sorted(toc_paragraphs, key=lambda x: x[0], reverse=True)
-    
+    # Elements are removed by reference (lxml unlinks a child in O(1)), so indices never
+    # shift under us - no need to sort, and no need to rebuild the whole body either
     removed_count = 0
-    for para_idx, para, text in sorted_toc:
+    for para_idx, para, text in toc_paragraphs:
         try:
             # Get the paragraph element and remove it
             p_element = para._element
@@ -294,12 +555,8 @@ def insert_toc_placeholder(doc, toc_heading_index: Optional[int] = None) -> bool
     if toc_heading_index is None:
         toc_heading_index = -1
         for i, para in enumerate(doc.paragraphs):
-            text_lower = para.text.strip().lower()
-            if any(keyword in text_lower for keyword in [
-                'table of contents', 'contents', 'table des matières',
-                'tabla de contenidos', 'índice', 'contenido', 'índice de contenidos',
-                'sommaire', 'inhaltsverzeichnis'
-            ]):
+            text_lower = para.text.strip().casefold()
+            if len(text_lower) <= _MAX_TOC_HEADING_LEN and _TOC_KEYWORD_RE.search(text_lower):
                 toc_heading_index = i
                 break
     
@@ -400,12 +657,15 @@ def process_toc_before_translation(doc) -> dict:
         'paragraphs_converted': 0,
         'toc_removed': 0,
         'placeholder_inserted': False,
-        'toc_end_index': -1
+        'toc_end_index': -1,
+        'toc_heading_index': -1
     }
     
-    # Step 1: Detect TOC
-    print(f"[TOC PROCESSING] Searching first 10 pages ({len(doc.paragraphs)} total paragraphs)...")
-    toc_paragraphs, toc_end_index = detect_toc_in_first_pages(doc, max_pages=10)
+    # Step 1: Detect TOC (only wraps and reads the first 10 pages' paragraphs - most documents have no TOC)
+    print(f"[TOC PROCESSING] Searching first 10 pages ({len(doc.element.body.p_lst)} total paragraphs)...")
+    first_paragraphs = _first_paragraphs(doc, 10 * 50)
+    cache = _TextCache.from_paragraphs(first_paragraphs)
+    toc_paragraphs, toc_end_index, toc_heading_index = _detect_toc(doc, 10, first_paragraphs, cache)
     print(f"[TOC PROCESSING] Found {len(toc_paragraphs)} potential TOC entries")
     
     if not toc_paragraphs:
@@ -415,6 +675,7 @@ def process_toc_before_translation(doc) -> dict:
     results['toc_found'] = True
     results['toc_entries_count'] = len(toc_paragraphs)
     results['toc_end_index'] = toc_end_index
+    results['toc_heading_index'] = toc_heading_index
     print(f"[TOC PROCESSING] TOC found! {len(toc_paragraphs)} entries, ends at index {toc_end_index}")
     
     # Step 2: Extract titles
@@ -426,6 +687,11 @@ def process_toc_before_translation(doc) -> dict:
         print("[TOC PROCESSING] No titles extracted, returning early")
         return results
     
+    # Build the full paragraph list once for matching; it stays valid until
+    # step 4 removes the TOC entries. Only the paragraphs past the first pages still need reading.
+    paragraphs = doc.paragraphs
+    cache.extend(paragraphs[len(cache.texts):])
+    
     # Step 3: Find matching paragraphs and convert to Heading 2
     # CRITICAL: Only search paragraphs AFTER the TOC to avoid converting titles that appear before TOC
     # We want to preserve the formatting of titles that appear before the TOC (like the first book title)
@@ -444,7 +710,8 @@ def process_toc_before_translation(doc) -> dict:
         search_start_index = 0
     
     print(f"[TOC PROCESSING] Finding matching paragraphs for {len(titles)} titles (searching from paragraph {search_start_index} onwards to skip TOC and content before it)...")
-    matches = find_matching_paragraphs(doc, titles, start_index=search_start_index)
+    matches = find_matching_paragraphs(doc, titles, start_index=search_start_index,
+                                       paragraphs=paragraphs, cache=cache)
     print(f"[TOC PROCESSING] Found {len(matches)} matching paragraphs (all after TOC)")
     converted = convert_to_heading_2(doc, matches)
     results['paragraphs_converted'] = converted
@@ -456,20 +723,11 @@ def process_toc_before_translation(doc) -> dict:
     print(f"[TOC PROCESSING] Removed {removed} TOC entry paragraphs")
     
     # Step 5: Insert placeholder
-    # Find TOC heading index
-    toc_heading_idx = None
-    for i, para in enumerate(doc.paragraphs):
-        text_lower = para.text.strip().lower()
-        if any(keyword in text_lower for keyword in [
-            'table of contents', 'contents', 'table des matières',
-            'tabla de contenidos', 'índice', 'contenido', 'índice de contenidos',
-            'sommaire', 'inhaltsverzeichnis'
-        ]):
-            toc_heading_idx = i
-            break
-    
-    if toc_heading_idx is not None:
-        placeholder_inserted = insert_toc_placeholder(doc, toc_heading_idx)
+    # The TOC heading is the first keyword paragraph in the document (detection found it);
+    # its index only shifts by the removed entries that came before it
+    if toc_heading_index >= 0:
+        removed_before_heading = sum(1 for para_idx, _, _ in toc_paragraphs if para_idx < toc_heading_index)
+        placeholder_inserted = insert_toc_placeholder(doc, toc_heading_index - removed_before_heading)
         results['placeholder_inserted'] = placeholder_inserted
     
     return results
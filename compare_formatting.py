@@ -2,45 +2,80 @@
 Compare formatting between original and translated DOCX files
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 from docx import Document
 import os
 
-def analyze_document_formatting(file_path):
-    """Analyze formatting of a DOCX document"""
+@dataclass
+class ParaInfo:
+    """What the comparison summary needs from one non-empty paragraph"""
+    num_runs: int
+    bold_runs: List[str]  # Text of each bold run
+    runs: List[Tuple[str, Optional[bool]]]  # (text, bold) of every run
+
+def analyze_document_formatting(file_path, emit=print):
+    """Analyze formatting of a DOCX document, passing each output line to emit.
+    
+    Returns a ParaInfo for each non-empty paragraph.
+    """
     doc = Document(file_path)
+    infos = []
     
-    print(f"\n{'='*60}")
-    print(f"Analyzing: {os.path.basename(file_path)}")
-    print(f"{'='*60}\n")
+    emit(f"\n{'='*60}")
+    emit(f"Analyzing: {os.path.basename(file_path)}")
+    emit(f"{'='*60}\n")
     
     para_count = 0
     
     for i, para in enumerate(doc.paragraphs):
+        # para.text / run.text re-join the run XML on every access - read them once
+        text = para.text
+        
         # Skip empty paragraphs
-        if not para.text.strip():
+        if not text.strip():
             continue
             
         para_count += 1
-        print(f"Paragraph {para_count} (Index {i}):")
-        print(f"  Text: {para.text[:50]}..." if len(para.text) > 50 else f"  Text: {para.text}")
-        print(f"  Style: {para.style.name if para.style else 'None'}")
-        print(f"  Alignment: {para.alignment}")
-        print(f"  Number of runs: {len(para.runs)}")
+        runs = para.runs
+        emit(f"Paragraph {para_count} (Index {i}):")
+        emit(f"  Text: {text[:50]}..." if len(text) > 50 else f"  Text: {text}")
+        emit(f"  Style: {para.style.name if para.style else 'None'}")
+        emit(f"  Alignment: {para.alignment}")
+        emit(f"  Number of runs: {len(runs)}")
         
         # Analyze runs (text segments with formatting)
-        for j, run in enumerate(para.runs):
-            if run.text.strip():  # Only show non-empty runs
-                print(f"\n  Run {j}:")
-                print(f"    Text: '{run.text}'")
-                print(f"    Bold: {run.bold}")
-                print(f"    Italic: {run.italic}")
-                print(f"    Underline: {run.underline}")
+        run_details = []
+        for j, run in enumerate(runs):
+            run_text = run.text
+            run_details.append((run_text, run.bold))
+            if run_text.strip():  # Only show non-empty runs
+                emit(f"\n  Run {j}:")
+                emit(f"    Text: '{run_text}'")
+                emit(f"    Bold: {run.bold}")
+                emit(f"    Italic: {run.italic}")
+                emit(f"    Underline: {run.underline}")
                 if run.font.name:
-                    print(f"    Font: {run.font.name}")
+                    emit(f"    Font: {run.font.name}")
                 if run.font.size:
-                    print(f"    Size: {run.font.size}")
+                    emit(f"    Size: {run.font.size}")
         
-        print("\n" + "-"*40 + "\n")
+        emit("\n" + "-"*40 + "\n")
+        
+        infos.append(ParaInfo(
+            num_runs=len(runs),
+            bold_runs=[run_text for run_text, bold in run_details if bold],
+            runs=run_details,
+        ))
+    
+    return infos
+
+def _collect_analysis(file_path):
+    """Run analyze_document_formatting, returning (its output lines, its ParaInfos) instead of printing"""
+    lines = []
+    infos = analyze_document_formatting(file_path, emit=lines.append)
+    return lines, infos
 
 def compare_documents():
     """Compare original and translated documents"""
@@ -50,23 +85,19 @@ def compare_documents():
     print("DOCUMENT FORMATTING COMPARISON")
     print("="*60)
     
-    # Analyze original
-    analyze_document_formatting(original_path)
-    
-    # Analyze translated
-    analyze_document_formatting(translated_path)
+    # Analyze original and translated side by side (each loads and walks its own document),
+    # then print the reports in order so they don't interleave
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        (orig_report, orig_paras), (trans_report, trans_paras) = executor.map(
+            _collect_analysis, [original_path, translated_path])
+    for report in (orig_report, trans_report):
+        print("\n".join(report))
     
     # Quick comparison
     print("\n" + "="*60)
     print("QUICK COMPARISON SUMMARY")
     print("="*60)
     
-    doc_orig = Document(original_path)
-    doc_trans = Document(translated_path)
-    
-    orig_paras = [p for p in doc_orig.paragraphs if p.text.strip()]
-    trans_paras = [p for p in doc_trans.paragraphs if p.text.strip()]
-    
     print(f"\nOriginal paragraphs: {len(orig_paras)}")
     print(f"Translated paragraphs: {len(trans_paras)}")
     
@@ -77,21 +108,19 @@ def compare_documents():
     print("\nBOLD TEXT ANALYSIS:")
     print("-"*40)
     
-    for i, para in enumerate(orig_paras):
-        bold_runs = [run for run in para.runs if run.bold]
-        if bold_runs:
-            orig_bold_count += len(bold_runs)
-            print(f"Original Para {i+1}: {len(bold_runs)} bold runs")
-            for run in bold_runs:
-                print(f"  - '{run.text}'")
-    
-    for i, para in enumerate(trans_paras):
-        bold_runs = [run for run in para.runs if run.bold]
-        if bold_runs:
-            trans_bold_count += len(bold_runs)
-            print(f"Translated Para {i+1}: {len(bold_runs)} bold runs")
-            for run in bold_runs:
-                print(f"  - '{run.text}'")
+    for i, info in enumerate(orig_paras):
+        if info.bold_runs:
+            orig_bold_count += len(info.bold_runs)
+            print(f"Original Para {i+1}: {len(info.bold_runs)} bold runs")
+            for run_text in info.bold_runs:
+                print(f"  - '{run_text}'")
+    
+    for i, info in enumerate(trans_paras):
+        if info.bold_runs:
+            trans_bold_count += len(info.bold_runs)
+            print(f"Translated Para {i+1}: {len(info.bold_runs)} bold runs")
+            for run_text in info.bold_runs:
+                print(f"  - '{run_text}'")
     
     print(f"\nTotal bold runs - Original: {orig_bold_count}, Translated: {trans_bold_count}")
     
@@ -100,8 +129,8 @@ def compare_documents():
     print("-"*40)
     
     for i in range(min(len(orig_paras), len(trans_paras))):
-        orig_runs = len(orig_paras[i].runs)
-        trans_runs = len(trans_paras[i].runs)
+        orig_runs = orig_paras[i].num_runs
+        trans_runs = trans_paras[i].num_runs
         
         if orig_runs != trans_runs:
             print(f"Para {i+1}: Run count mismatch - Original: {orig_runs}, Translated: {trans_runs}")
@@ -110,10 +139,11 @@ def compare_documents():
             if orig_runs > 1 and trans_runs == 1:
                 print(f"  ⚠️  Multiple runs collapsed into single run (formatting lost!)")
                 print(f"  Original runs:")
-                for j, run in enumerate(orig_paras[i].runs):
-                    if run.text.strip():
-                        print(f"    Run {j}: '{run.text}' (Bold: {run.bold})")
-                print(f"  Translated: '{trans_paras[i].runs[0].text[:50]}...' (Bold: {trans_paras[i].runs[0].bold})")
+                for j, (run_text, bold) in enumerate(orig_paras[i].runs):
+                    if run_text.strip():
+                        print(f"    Run {j}: '{run_text}' (Bold: {bold})")
+                trans_text, trans_bold = trans_paras[i].runs[0]
+                print(f"  Translated: '{trans_text[:50]}...' (Bold: {trans_bold})")
 
 if __name__ == "__main__":
     compare_documents()